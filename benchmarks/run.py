@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmarks de Tektra (solo stdlib: time.perf_counter_ns + statistics).
+
+Casos:
+    factory.site / factory.image / factory.game   una llamada a cada factory; site rota entre
+                                                 SITE_VARIANTS sitios con los assets ya en cache
+    factory.placeholder_cold                     un placeholder 1200x600 renderizado de cero
+    orchestrator.cycle                           orchestrator.main([]) completo
+    api.<endpoint>                               endpoints Flask vía test_client, sin el
+                                                 cache de respuestas (api.*_cached: con cache)
+
+Todo corre contra un output/ y un status.db temporales (TEKTRA_OUTPUT y
+STATUS_DB se fijan antes de importar el repo). El resultado es un JSON con
+min / median / p95 en ms por caso; se compara contra benchmarks/baseline.json
+y el proceso sale con 1 si algún median empeora más que --threshold y,
+además, más que la dispersión medida (p95 - median) y que NOISE_FLOOR_MS.
+Un caso que parece empeorar se vuelve a medir una vez y se queda la corrida
+con mejor median: una ráfaga de ruido no alcanza para marcar regresión.
+
+El baseline se actualiza en un commit propio (--update-baseline), nunca
+junto con el cambio que se está midiendo.
+
+Uso:  python benchmarks/run.py [--only api.] [--threshold 0.3] [--update-baseline]
+"""
+
+from __future__ import annotations
+from pathlib import Path
+import argparse, itertools, json, logging, os, platform, random, statistics, sys, tempfile, time
+
+HERE = Path(__file__).parent.resolve()
+ROOT = HERE.parent
+BASELINE = HERE / "baseline.json"
+RESULTS = HERE / "results.json"
+# diferencias por debajo de esto (ms) son ruido aunque el ratio sea grande
+NOISE_FLOOR_MS = 0.5
+# cuántas veces la dispersión (p95 - median) tiene que superar el delta para contar
+SPREAD_K = 1.0
+
+def _setup_env(tmp: Path) -> None:
+    os.environ["TEKTRA_OUTPUT"] = str(tmp / "output")
+    os.environ["STATUS_DB"] = str(tmp / "status.db")
+    (tmp / "output").mkdir()
+    # mismos conceptos/paletas en cada corrida: los hits de los caches de assets no varían
+    random.seed(0)
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+
+def measure(fn, repeat: int, warmup: int = 1) -> dict:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter_ns()
+        fn()
+        samples.append((time.perf_counter_ns() - t0) / 1e6)
+    p95 = statistics.quantiles(samples, n=20)[18] if len(samples) > 1 else samples[0]
+    return {"n": repeat, "min": round(min(samples), 4), "median": round(statistics.median(samples), 4),
+            "p95": round(p95, 4)}
+
+# --- casos ---
+# factory.site mide la factory, no el render de imágenes: rota entre pocos sitios
+# fijos cuyos avatares y placeholders se generan antes de medir
+SITE_VARIANTS = 8
+
+def _factory_cases():
+    from factories.factory_websites import generate_site
+    from factories.factory_images import generate_image
+    from factories.factory_games import generate_game
+    from factories import placeholders
+
+    variants = itertools.cycle(range(SITE_VARIANTS))
+
+    def site():
+        random.seed(next(variants))
+        generate_site()
+
+    for _ in range(SITE_VARIANTS):
+        site()
+
+    seeds = itertools.count()
+    fmt = placeholders._format()
+
+    def placeholder_cold():
+        seed = f"bench:{next(seeds)}"
+        if fmt == "svg":
+            placeholders.render_svg(1200, 600, seed)
+        else:
+            placeholders.render_raster(1200, 600, seed, fmt)
+
+    return [("factory.site", site, 60), ("factory.image", generate_image, 150),
+            ("factory.game", generate_game, 60), ("factory.placeholder_cold", placeholder_cold, 40)]
+
+def _orchestrator_cases():
+    import orchestrator
+    logging.getLogger().setLevel(logging.WARNING)
+
+    def cycle():
+        # run_log.json del día crece con cada ciclo; sin borrarlo cada muestra costaría más que la anterior
+        for p in Path(os.environ["TEKTRA_OUTPUT"]).glob("*/run_log.json"):
+            p.unlink()
+        try:
+            orchestrator.main([])
+        except SystemExit:
+            pass
+    return [("orchestrator.cycle", cycle, 40)]
+
+def _seed_db(n: int = 5000) -> None:
+    import statusdb
+    con = statusdb.connect()
+    statusdb.ensure_schema(con)
+    kinds = ["websites", "images", "games", "notes"]
+    with statusdb.BatchWriter(con) as w:
+        for i in range(n):
+            day = f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}"
+            w.add(kinds[i % 4], f"Item {i} neon cosmic", f"output/{day}/item_{i}",
+                  ts=f"{day}T12:{i % 60:02d}:00", cost=0.01, meta={"prompt": f"cosmic neon city {i}"})
+    con.close()
+
+def _api_cases():
+    _seed_db()
+    from server.app import app, _cache
+    logging.getLogger().setLevel(logging.WARNING)
+    client = app.test_client()
+    sample = next(Path(os.environ["TEKTRA_OUTPUT"]).glob("*/web_*/index.html"), None)
+
+    def get(url, cache=False):
+        def call():
+            if not cache:
+                # se mide la consulta, no un hit del cache de respuestas
+                with _cache.lock:
+                    _cache.entries.clear()
+            r = client.get(url)
+            assert r.status_code in (200, 304), (url, r.status_code)
+            r.close()
+        return call
+
+    cases = [
+        ("api.novedades", get("/novedades?limit=50"), 300),
+        ("api.novedades_kind", get("/novedades?kind=games&limit=50"), 300),
+        ("api.quehaces", get("/quehaces"), 300),
+        ("api.buscar", get("/buscar?q=cosmic"), 300),
+        ("api.stats", get("/stats"), 300),
+        ("api.novedades_cached", get("/novedades?limit=50", cache=True), 300),
+    ]
+    if sample is not None:
+        rel = sample.relative_to(Path(os.environ["TEKTRA_OUTPUT"])).as_posix()
+        cases.append(("api.output_file", get(f"/output/{rel}"), 300))
+    return cases
+
+# prefijo de los casos -> función que los prepara (con --only no se prepara lo que no corre)
+GROUPS = {"factory.": _factory_cases, "orchestrator.": _orchestrator_cases, "api.": _api_cases}
+
+# --- comparación ---
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    for name, r in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        delta = r["median"] - base["median"]
+        # la dispersión de cualquiera de las dos corridas marca cuánto puede moverse el median por ruido
+        spread = max(base["p95"] - base["median"], r["p95"] - r["median"])
+        if delta > max(NOISE_FLOOR_MS, base["median"] * threshold, SPREAD_K * spread):
+            regressions.append(f"{name}: median {r['median']:.3f} ms vs {base['median']:.3f} ms "
+                               f"(+{100 * delta / base['median']:.0f}%)")
+    return regressions
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Benchmarks de factories, orquestador y API")
+    ap.add_argument("--only", help="correr solo los casos cuyo nombre empieza con este prefijo")
+    ap.add_argument("--threshold", type=float, default=0.30, help="empeoramiento tolerado del median (0.30 = 30%%)")
+    ap.add_argument("--scale", type=float, default=1.0, help="multiplicador de repeticiones")
+    ap.add_argument("--update-baseline", action="store_true")
+    ap.add_argument("--out", type=Path, default=RESULTS)
+    args = ap.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    baseline = {}
+    if BASELINE.exists() and not args.update_baseline:
+        baseline = json.loads(BASELINE.read_text(encoding="utf-8"))["results"]
+
+    with tempfile.TemporaryDirectory(prefix="tektra-bench-") as tmp:
+        _setup_env(Path(tmp))
+        results = {}
+        for prefix, group in GROUPS.items():
+            if args.only and not (prefix.startswith(args.only) or args.only.startswith(prefix)):
+                continue
+            for name, fn, repeat in group():
+                if args.only and not name.startswith(args.only):
+                    continue
+                repeat = max(1, int(repeat * args.scale))
+                r = measure(fn, repeat)
+                retried = ""
+                if compare({name: r}, baseline, args.threshold):
+                    again = measure(fn, repeat)
+                    r, retried = min(r, again, key=lambda x: x["median"]), "  (re-medido)"
+                results[name] = r
+                print(f"{name:<26} min {r['min']:>9.3f}  median {r['median']:>9.3f}  p95 {r['p95']:>9.3f} ms{retried}")
+
+    report = {"python": platform.python_version(), "machine": platform.machine(), "results": results}
+    args.out.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    if args.update_baseline:
+        BASELINE.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline actualizado: {BASELINE.relative_to(ROOT)}")
+        return 0
+    if not baseline:
+        print("Sin baseline; correr con --update-baseline para crearlo")
+        return 0
+    regressions = compare(results, baseline, args.threshold)
+    for line in regressions:
+        print(f"REGRESIÓN {line}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
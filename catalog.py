@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Catálogo binario de todos los items de output/.
+
+Formato columnar en log/catalog/: un archivo por columna, registros de ancho
+fijo, y una tabla de strings para las rutas.
+
+    id.u32  kind.u8  ts.i64  size.u64  path_off.u64  path_len.u16  strings.bin
+    days/<día>.u32  -> filas de cada día (para deduplicar sin leer todas las rutas)
+    meta.json  -> {"count": N, "hwm": mtime, "kinds": [...], "day_index": 1}
+
+Las columnas se leen con mmap + memoryview.cast (sin copiar). Agregar items
+es append a cada archivo; meta.json se escribe al final y es el punto de
+commit: lo que quede después de `count` (un append cortado) se descarta,
+también en days/ (las filas >= count se ignoran).
+
+update() solo lista los días modificados desde la marca de agua y solo
+decodifica las rutas de esos días: su costo depende de lo nuevo, no del
+tamaño del catálogo.
+
+Uso:  python catalog.py update [--full]
+      python catalog.py ls [--kind games] [--since 2025-09-15] [--until ...] [--limit 20]
+"""
+
+from __future__ import annotations
+from pathlib import Path
+import argparse, array, datetime as dt, json, logging, mmap, os, re, shutil, sys
+
+import config, scanner
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ROOT = Path(__file__).parent.resolve()
+CATALOG_DIR = ROOT / "log" / "catalog"
+
+log = logging.getLogger("tektra.catalog")
+
+KINDS = ["", "websites", "images", "games", "notes"]
+DAYS_DIR = "days"
+DAY_INDEX_VERSION = 1
+# (archivo, código de memoryview.cast, tamaño)
+COLUMNS = {
+    "id": ("id.u32", "I", 4),
+    "kind": ("kind.u8", "B", 1),
+    "ts": ("ts.i64", "q", 8),
+    "size": ("size.u64", "Q", 8),
+    "path_off": ("path_off.u64", "Q", 8),
+    "path_len": ("path_len.u16", "H", 2),
+}
+
+def _epoch(ts: str) -> int:
+    try:
+        return int(dt.datetime.fromisoformat(ts).timestamp())
+    except ValueError:
+        return 0
+
+class Catalog:
+    def __init__(self, root: Path = CATALOG_DIR):
+        self.root = root
+        self._maps = []
+        self.open()
+
+    # --- lectura ---
+    def open(self) -> None:
+        self.close()
+        meta_path = self.root / "meta.json"
+        self.meta = json.loads(meta_path.read_text()) if meta_path.exists() else {"count": 0, "hwm": 0.0, "kinds": KINDS}
+        n = self.meta["count"]
+        self.cols = {}
+        for col, (fname, code, width) in COLUMNS.items():
+            self.cols[col] = self._map(self.root / fname, n * width).cast(code)
+        self.strings = self._map(self.root / "strings.bin", None)
+
+    def _map(self, path: Path, length: int | None) -> memoryview:
+        if not path.exists() or path.stat().st_size == 0 or length == 0:
+            return memoryview(b"")
+        f = open(path, "rb")
+        m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        f.close()
+        self._maps.append(m)
+        view = memoryview(m)
+        return view if length is None else view[:length]
+
+    def close(self) -> None:
+        for name in ("cols", "strings"):
+            if hasattr(self, name):
+                delattr(self, name)
+        for m in self._maps:
+            try:
+                m.close()
+            except BufferError:
+                pass   # todavía hay vistas afuera; el GC lo cierra después
+        self._maps = []
+
+    def __len__(self) -> int:
+        return self.meta["count"]
+
+    def path(self, i: int) -> str:
+        off, n = self.cols["path_off"][i], self.cols["path_len"][i]
+        return bytes(self.strings[off:off + n]).decode("utf-8")
+
+    def record(self, i: int) -> dict:
+        return {"id": self.cols["id"][i], "kind": KINDS[self.cols["kind"][i]],
+                "ts": dt.datetime.fromtimestamp(self.cols["ts"][i]).isoformat(),
+                "size": self.cols["size"][i], "path": self.path(i)}
+
+    def select(self, kind: str | None = None, since: int | None = None, until: int | None = None):
+        """Índices de los registros que cumplen el filtro (ts en epoch, until exclusivo)"""
+        n = len(self)
+        if np is not None and n:
+            mask = np.ones(n, dtype=bool)
+            if kind:
+                mask &= np.frombuffer(self.cols["kind"], dtype=np.uint8) == KINDS.index(kind)
+            ts = np.frombuffer(self.cols["ts"], dtype=np.int64)
+            if since is not None:
+                mask &= ts >= since
+            if until is not None:
+                mask &= ts < until
+            return np.flatnonzero(mask).tolist()
+        if kind:
+            # sin NumPy: la búsqueda del byte de kind la hace re en C
+            code = re.escape(bytes([KINDS.index(kind)]))
+            idx = [m.start() for m in re.finditer(code, bytes(self.cols["kind"]))]
+        else:
+            idx = range(n)
+        ts = self.cols["ts"]
+        return [i for i in idx
+                if (since is None or ts[i] >= since) and (until is None or ts[i] < until)]
+
+    # --- escritura ---
+    def append(self, records: list[dict], hwm: float | None = None) -> int:
+        """Agrega registros (formato de scanner.classify) y confirma reescribiendo meta.json"""
+        n = len(self)
+        self.root.mkdir(parents=True, exist_ok=True)
+        strings_path = self.root / "strings.bin"
+        str_off = strings_path.stat().st_size if strings_path.exists() else 0
+        cols = {c: [] for c in COLUMNS}
+        blob = bytearray()
+        for k, rec in enumerate(records):
+            encoded = rec["path"].encode("utf-8")
+            cols["id"].append(n + k + 1)
+            cols["kind"].append(KINDS.index(rec["kind"]) if rec["kind"] in KINDS else 0)
+            cols["ts"].append(_epoch(rec["ts"]))
+            cols["size"].append(int(rec.get("meta", {}).get("size_bytes", 0)))
+            cols["path_off"].append(str_off + len(blob))
+            cols["path_len"].append(len(encoded))
+            blob += encoded
+        self.close()
+        with open(strings_path, "ab") as f:
+            f.write(blob)
+        for col, (fname, code, width) in COLUMNS.items():
+            with open(self.root / fname, "ab") as f:
+                f.truncate(n * width)   # descarta un append anterior que no llegó a confirmarse
+                f.write(array.array(code, cols[col]).tobytes())
+        day_rows = {}
+        for k, rec in enumerate(records):
+            day_rows.setdefault(_day_of(rec["path"]), []).append(n + k)
+        self._append_day_rows(day_rows)
+        meta = {"count": n + len(records), "hwm": hwm if hwm is not None else self.meta["hwm"], "kinds": KINDS,
+                "day_index": DAY_INDEX_VERSION}
+        tmp = self.root / "meta.json.tmp"
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, self.root / "meta.json")
+        self.open()
+        return len(records)
+
+    # --- índice por día ---
+    def _append_day_rows(self, day_rows: dict[str, list[int]]) -> None:
+        days_dir = self.root / DAYS_DIR
+        days_dir.mkdir(parents=True, exist_ok=True)
+        for day, rows in day_rows.items():
+            with open(days_dir / f"{day}.u32", "ab") as f:
+                f.write(array.array("I", rows).tobytes())
+
+    def day_paths(self, day: str) -> set[str]:
+        """Rutas ya catalogadas de un día (solo se decodifican las filas de ese día)"""
+        path = self.root / DAYS_DIR / f"{day}.u32"
+        if not path.exists():
+            return set()
+        rows = array.array("I", path.read_bytes())
+        n = len(self)
+        return {self.path(i) for i in set(rows) if i < n}
+
+    def rebuild_day_index(self) -> None:
+        """Crea days/ para un catálogo anterior al índice (recorre todas las rutas una vez)"""
+        shutil.rmtree(self.root / DAYS_DIR, ignore_errors=True)
+        day_rows = {}
+        for i in range(len(self)):
+            day_rows.setdefault(_day_of(self.path(i)), []).append(i)
+        self._append_day_rows(day_rows)
+        self.meta["day_index"] = DAY_INDEX_VERSION
+        tmp = self.root / "meta.json.tmp"
+        tmp.write_text(json.dumps(self.meta))
+        os.replace(tmp, self.root / "meta.json")
+
+def _day_of(path: str) -> str:
+    # output/<día>/<entrada>
+    return path.split("/")[1]
+
+def update(cat: Catalog, output_root: Path | None = None, full: bool = False) -> int:
+    """Agrega al catálogo los items de los días modificados desde la última actualización"""
+    output_root = output_root or config.output_root()
+    if len(cat) and cat.meta.get("day_index") != DAY_INDEX_VERSION:
+        cat.rebuild_day_index()
+    hwm = 0.0 if full else cat.meta["hwm"]
+    new_hwm, pending = hwm, []
+    for day, mtime, records in scanner.scan_by_day(output_root, min_mtime=hwm):
+        known = cat.day_paths(day)
+        pending.extend(r for r in records if r["path"] not in known)
+        new_hwm = max(new_hwm, mtime)
+    return cat.append(pending, hwm=new_hwm)
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Catálogo binario de output/")
+    ap.add_argument("--catalog", type=Path, default=CATALOG_DIR)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    up = sub.add_parser("update", help="agregar items nuevos de output/")
+    up.add_argument("--output", type=Path, help="default: output.base_dir de config.yaml")
+    up.add_argument("--full", action="store_true", help="revisar todos los días, no solo los modificados")
+    ls = sub.add_parser("ls", help="listar/filtrar items")
+    ls.add_argument("--kind", choices=[k for k in KINDS if k])
+    ls.add_argument("--since")
+    ls.add_argument("--until")
+    ls.add_argument("--limit", type=int, default=50)
+    args = ap.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    cat = Catalog(args.catalog)
+    if args.cmd == "update":
+        n = update(cat, (args.output or config.output_root()).resolve(), full=args.full)
+        log.info("Catálogo: %d items nuevos (%d en total)", n, len(cat))
+        return
+    since = _epoch(args.since) if args.since else None
+    until = _epoch(args.until) if args.until else None
+    hits = cat.select(args.kind, since, until)
+    for i in hits[-args.limit:][::-1]:
+        r = cat.record(i)
+        sys.stdout.write(f"{r['ts']}  {r['kind']:<8} {r['size']:>9}  {r['path']}\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Configuración de Tektra (config.yaml) como objeto inmutable y validado.
+
+get() parsea el YAML una sola vez y lo cachea; en procesos largos (servidor,
+daemon) vuelve a leerlo solo si cambió el mtime del archivo, y como mucho
+un os.stat cada CHECK_INTERVAL segundos. Si la versión nueva no valida, se
+loguea el error y se sigue usando la anterior.
+
+Uso:  python config.py   # valida config.yaml y muestra el resultado
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+import json, logging, os, threading, time
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+ROOT = Path(__file__).parent.resolve()
+CONFIG_PATH = Path(os.environ.get("TEKTRA_CONFIG", ROOT / "config.yaml"))
+CHECK_INTERVAL = 1.0
+
+log = logging.getLogger("tektra.config")
+
+AVATAR_PROVIDERS = ("dicebear", "ui-avatars", "local", "local-initials")
+IMAGE_PROVIDERS = ("local", "picsum")
+FSYNC_POLICIES = ("none", "item", "batch")
+
+_YAML_ERRORS = (yaml.YAMLError,) if yaml else ()
+
+class ConfigError(ValueError):
+    pass
+
+@dataclass(frozen=True)
+class Weights:
+    images: float = 0.40
+    webs: float = 0.40
+    games: float = 0.20
+
+@dataclass(frozen=True)
+class Limits:
+    max_items_per_day: int = 30
+    daily_budget_usd: float = 0.0
+
+@dataclass(frozen=True)
+class Output:
+    base_dir: Path = ROOT / "output"
+    fsync: str = "none"
+
+@dataclass(frozen=True)
+class WebGeneration:
+    min_sections: int = 6
+    min_images_per_section: int = 2
+    ensure_login_link: bool = True
+    templates: tuple = ("corporate", "portfolio", "store", "blog", "gallery")
+    image_provider: str = "local"
+
+@dataclass(frozen=True)
+class ContactGeneration:
+    preferred_domains: tuple = ("example.com", "studio.com", "designco.io", "techhub.dev", "makerstudio.ai")
+    forbid_generic_domains: frozenset = frozenset({"gmail.com", "hotmail.com", "yahoo.com"})
+    avatar_provider: str = "local"
+
+@dataclass(frozen=True)
+class Config:
+    weights: Weights = field(default_factory=Weights)
+    limits: Limits = field(default_factory=Limits)
+    output: Output = field(default_factory=Output)
+    web_generation: WebGeneration = field(default_factory=WebGeneration)
+    contact_generation: ContactGeneration = field(default_factory=ContactGeneration)
+
+# --- validación ---
+def _section(raw: dict, name: str) -> dict:
+    value = raw.get(name) or {}
+    if not isinstance(value, dict):
+        raise ConfigError(f"{name}: se esperaba un mapa")
+    return value
+
+def _number(sec: str, key: str, value, kind=float, minimum=0):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or (kind is int and not isinstance(value, int)):
+        raise ConfigError(f"{sec}.{key}: se esperaba {kind.__name__}, no {value!r}")
+    if value < minimum:
+        raise ConfigError(f"{sec}.{key}: debe ser >= {minimum}")
+    return kind(value)
+
+def _strings(sec: str, key: str, value) -> tuple:
+    if not isinstance(value, list) or not all(isinstance(v, str) and v for v in value):
+        raise ConfigError(f"{sec}.{key}: se esperaba una lista de strings")
+    return tuple(value)
+
+def _choice(sec: str, key: str, value, options: tuple) -> str:
+    if value not in options:
+        raise ConfigError(f"{sec}.{key}: {value!r} no es uno de {', '.join(options)}")
+    return value
+
+def _build(sec_name: str, cls, raw: dict, convert: dict):
+    unknown = set(raw) - set(cls.__dataclass_fields__)
+    if unknown:
+        raise ConfigError(f"{sec_name}: claves desconocidas {sorted(unknown)}")
+    return cls(**{k: convert[k](v) for k, v in raw.items()})
+
+def parse(raw: dict | None) -> Config:
+    """Valida el dict del YAML y arma el Config (los faltantes toman el default)"""
+    raw = raw or {}
+    if not isinstance(raw, dict):
+        raise ConfigError("config.yaml: se esperaba un mapa en la raíz")
+    w = _section(raw, "weights")
+    weights = _build("weights", Weights, w, {k: (lambda v, k=k: _number("weights", k, v)) for k in ("images", "webs", "games")})
+    if weights.images + weights.webs + weights.games <= 0:
+        raise ConfigError("weights: al menos un peso debe ser > 0")
+    limits = _build("limits", Limits, _section(raw, "limits"), {
+        "max_items_per_day": lambda v: _number("limits", "max_items_per_day", v, int),
+        "daily_budget_usd": lambda v: _number("limits", "daily_budget_usd", v),
+    })
+    output = _build("output", Output, _section(raw, "output"), {
+        "base_dir": lambda v: (ROOT / str(v)).resolve(),
+        "fsync": lambda v: _choice("output", "fsync", v, FSYNC_POLICIES),
+    })
+    web = _build("web_generation", WebGeneration, _section(raw, "web_generation"), {
+        "min_sections": lambda v: _number("web_generation", "min_sections", v, int, 1),
+        "min_images_per_section": lambda v: _number("web_generation", "min_images_per_section", v, int),
+        "ensure_login_link": bool,
+        "templates": lambda v: _strings("web_generation", "templates", v),
+        "image_provider": lambda v: _choice("web_generation", "image_provider", v, IMAGE_PROVIDERS),
+    })
+    contact = _build("contact_generation", ContactGeneration, _section(raw, "contact_generation"), {
+        "preferred_domains": lambda v: _strings("contact_generation", "preferred_domains", v),
+        "forbid_generic_domains": lambda v: frozenset(d.lower() for d in _strings("contact_generation", "forbid_generic_domains", v)),
+        "avatar_provider": lambda v: _choice("contact_generation", "avatar_provider", v, AVATAR_PROVIDERS),
+    })
+    unknown = set(raw) - set(Config.__dataclass_fields__)
+    if unknown:
+        log.warning("config.yaml: secciones ignoradas %s", sorted(unknown))
+    return Config(weights, limits, output, web, contact)
+
+def load(path: Path = CONFIG_PATH) -> Config:
+    if yaml is None:
+        log.warning("PyYAML no está instalado: se usa la configuración por defecto")
+        return Config()
+    with open(path, encoding="utf-8") as f:
+        return parse(yaml.safe_load(f))
+
+# --- cache con hot reload ---
+_lock = threading.Lock()
+_states: dict[Path, dict] = {}
+
+def get(path: Path = CONFIG_PATH) -> Config:
+    """Config vigente; relee el archivo solo si cambió su mtime"""
+    now = time.monotonic()
+    _state = _states.get(path) or _states.setdefault(path, {"config": None, "mtime": None, "checked": 0.0})
+    cfg = _state["config"]
+    if cfg is not None and now - _state["checked"] < CHECK_INTERVAL:
+        return cfg
+    with _lock:
+        _state["checked"] = now
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if cfg is not None and mtime == _state["mtime"]:
+            return cfg
+        try:
+            new = load(path) if mtime is not None else Config()
+        except (OSError, ValueError, *_YAML_ERRORS) as e:
+            if cfg is None:
+                raise
+            log.error("config.yaml inválido, se mantiene la versión anterior: %s", e)
+            _state["mtime"] = mtime
+            return cfg
+        if cfg is not None:
+            log.info("config.yaml recargado")
+        _state["config"], _state["mtime"] = new, mtime
+        return new
+
+def output_root() -> Path:
+    """Raíz de output/: output.base_dir vigente (TEKTRA_OUTPUT la redirige, p. ej. en benchmarks)"""
+    env = os.environ.get("TEKTRA_OUTPUT")
+    return Path(env).resolve() if env else get().output.base_dir
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    cfg = load()
+    print(json.dumps(asdict(cfg), default=lambda v: sorted(v) if isinstance(v, frozenset) else str(v),
+                     ensure_ascii=False, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Avatares locales y deterministas (reemplazo de dicebear / ui-avatars).
+
+- identicon: grilla 5×5 simétrica derivada del sha256 del nombre
+- initials:  iniciales sobre un círculo del color derivado del nombre
+
+Se renderizan como SVG (o PNG con Pillow) y se guardan en un ContentCache
+en <output>/_avatars/, así el mismo nombre no se vuelve a renderizar.
+"""
+
+from html import escape
+import colorsys
+import hashlib
+import io
+
+from factories import diskcache
+
+try:
+    from PIL import Image, ImageDraw
+except ImportError:
+    Image = None
+
+AVATAR_SUBDIR = "_avatars"
+AVATAR_VERSION = 1   # subir si cambia el renderer
+MAX_CACHE_BYTES = 16 * 1024 * 1024
+
+def _digest(seed: str) -> bytes:
+    return hashlib.sha256(seed.encode("utf-8")).digest()
+
+def _colors(d: bytes) -> tuple:
+    hue = d[0] * 360 // 256
+    return f"hsl({hue},65%,55%)", f"hsl({hue},40%,94%)", hue
+
+def _cells(d: bytes) -> list:
+    # 15 bits deciden la mitad izquierda + columna central; se espeja
+    cells = []
+    for i in range(15):
+        if (d[1 + i // 8] >> (i % 8)) & 1:
+            col, row = divmod(i, 5)
+            cells.append((col, row))
+            if col < 2:
+                cells.append((4 - col, row))
+    return cells
+
+def _initials(name: str) -> str:
+    parts = [p for p in name.replace("_", " ").split() if p]
+    return "".join(p[0] for p in parts[:2]).upper() or "?"
+
+def identicon_svg(seed: str, size: int = 256) -> str:
+    d = _digest(seed)
+    fg, bg, _ = _colors(d)
+    cell = size / 6
+    rects = "".join(f'<rect x="{cell * (0.5 + c):.1f}" y="{cell * (0.5 + r):.1f}" width="{cell:.1f}" height="{cell:.1f}"/>'
+                    for c, r in _cells(d))
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" viewBox="0 0 {size} {size}">'
+            f'<rect width="{size}" height="{size}" fill="{bg}"/><g fill="{fg}">{rects}</g></svg>')
+
+def initials_svg(seed: str, size: int = 256) -> str:
+    fg, _, _ = _colors(_digest(seed))
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" viewBox="0 0 {size} {size}">'
+            f'<circle cx="{size / 2}" cy="{size / 2}" r="{size / 2}" fill="{fg}"/>'
+            f'<text x="50%" y="50%" dy=".35em" text-anchor="middle" fill="#fff" '
+            f'font-family="Inter,Arial,sans-serif" font-weight="600" font-size="{size * 0.4:.0f}">'
+            f'{escape(_initials(seed))}</text></svg>')
+
+def identicon_png(seed: str, size: int = 256) -> bytes:
+    d = _digest(seed)
+    _, _, hue = _colors(d)
+    fg = tuple(int(v * 255) for v in colorsys.hls_to_rgb(hue / 360, 0.55, 0.65))
+    bg = tuple(int(v * 255) for v in colorsys.hls_to_rgb(hue / 360, 0.94, 0.40))
+    img = Image.new("RGB", (size, size), bg)
+    draw = ImageDraw.Draw(img)
+    cell = size / 6
+    for c, r in _cells(d):
+        x, y = cell * (0.5 + c), cell * (0.5 + r)
+        draw.rectangle((x, y, x + cell - 1, y + cell - 1), fill=fg)
+    buf = io.BytesIO()
+    img.save(buf, "PNG", optimize=True)
+    return buf.getvalue()
+
+def avatar_file(name: str, style: str = "identicon", size: int = 256, fmt: str = "svg") -> tuple[str, bytes]:
+    """(nombre de archivo, bytes) del avatar cacheado (lo renderiza si no existe). PNG requiere Pillow; si no, SVG"""
+    seed = (name or "tektra_user").replace(" ", "_")
+    if fmt == "png" and (Image is None or style != "identicon"):
+        fmt = "svg"
+    key = f"v{AVATAR_VERSION}:{style}:{size}:{fmt}:{seed}"
+    if fmt == "png":
+        render = lambda: identicon_png(seed, size)
+    else:
+        svg = initials_svg if style == "initials" else identicon_svg
+        render = lambda: svg(seed, size).encode("utf-8")
+    return diskcache.for_output(AVATAR_SUBDIR, MAX_CACHE_BYTES).fetch(key, fmt, render)
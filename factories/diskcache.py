@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+Directorio de cache direccionado por contenido con tope de tamaño (LRU).
+
+Cada entrada es <sha256(clave)[:20]>.<ext>. Un hit actualiza el mtime del
+archivo, y al superar max_bytes se borran las entradas con mtime más viejo.
+Sin raíz (root=None) el cache vive solo en memoria, con el mismo tope; es
+lo que usan las factories en --dry-run (use_memory()).
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+import hashlib
+import logging
+import os
+import threading
+
+log = logging.getLogger("tektra.diskcache")
+
+class ContentCache:
+    def __init__(self, root: Path | None, max_bytes: int):
+        self.root = Path(root) if root is not None else None
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._size = None   # se calcula en el primer put
+        self._mem = OrderedDict() if root is None else None
+
+    @staticmethod
+    def name_for(key: str, ext: str) -> str:
+        return f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:20]}.{ext}"
+
+    def path_for(self, key: str, ext: str) -> Path:
+        return self.root / self.name_for(key, ext)
+
+    def put(self, key: str, ext: str, data: bytes) -> Path:
+        p = self.path_for(key, ext)
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_name(f"{p.name}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, p)
+        with self._lock:
+            if self._size is None:
+                self._size = sum(e.stat().st_size for e in os.scandir(self.root) if e.is_file())
+            else:
+                self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+        return p
+
+    def fetch(self, key: str, ext: str, render) -> tuple[str, bytes]:
+        """(nombre, bytes) de la entrada; si no existe, render() la produce y se guarda"""
+        if self._mem is not None:
+            return self._fetch_memory(key, ext, render)
+        p = self.path_for(key, ext)
+        try:
+            data = p.read_bytes()
+        except FileNotFoundError:
+            data = render()
+            self.put(key, ext, data)
+            return p.name, data
+        try:
+            os.utime(p)
+        except FileNotFoundError:
+            pass   # la evicción la borró después de leerla: los bytes siguen sirviendo
+        return p.name, data
+
+    def _fetch_memory(self, key: str, ext: str, render) -> tuple[str, bytes]:
+        name = self.name_for(key, ext)
+        with self._lock:
+            data = self._mem.get(name)
+            if data is not None:
+                self._mem.move_to_end(name)
+                return name, data
+        data = render()
+        with self._lock:
+            if name not in self._mem:
+                self._mem[name] = data
+                self._size = (self._size or 0) + len(data)
+            while self._size > self.max_bytes and len(self._mem) > 1:
+                self._size -= len(self._mem.popitem(last=False)[1])
+        return name, data
+
+    def _evict(self) -> None:
+        entries = sorted((e.stat().st_mtime, e.stat().st_size, e.path)
+                         for e in os.scandir(self.root) if e.is_file() and not e.name.endswith(".tmp"))
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.8   # margen para no evictar en cada put
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        log.debug("Cache %s: evicción hasta %d bytes", self.root.name, total)
+        self._size = total
+
+_caches: dict[Path, ContentCache] = {}
+_caches_lock = threading.Lock()
+_memory: dict[str, ContentCache] | None = None
+
+def use_memory(enabled: bool = True) -> None:
+    """Desde ahora for_output() devuelve caches en memoria (sin tocar output/); para --dry-run"""
+    global _memory
+    with _caches_lock:
+        _memory = {} if enabled else None
+
+def for_output(subdir: str, max_bytes: int) -> ContentCache:
+    """Cache en output_root()/subdir; se resuelve en cada llamada, así sigue a la raíz vigente"""
+    memory = _memory
+    if memory is not None:
+        cache = memory.get(subdir)
+        if cache is None:
+            with _caches_lock:
+                cache = memory.setdefault(subdir, ContentCache(None, max_bytes))
+        return cache
+    from factories.utils import output_root
+    root = output_root() / subdir
+    cache = _caches.get(root)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.setdefault(root, ContentCache(root, max_bytes))
+    return cache
@@ -1,10 +1,16 @@
 # -*- coding: utf-8 -*-
-from pathlib import Path
 import datetime as dt
 import json
 import re
 
-ROOT = Path(__file__).resolve().parents[1]
+from factories.sprites import build_atlas, ORB_RUNNER_SPRITES
+from factories.utils import output_root
+from factories.writer import get_writer
+
+# Parámetros del runtime emitido (se inyectan como JSON en cada juego)
+POOL_SIZE = 4096      # orbes preasignados; nunca se crean objetos en el loop
+GRID_CELL = 48        # lado de celda del broad phase (>= diámetro máximo de orbe)
+MAX_ORB_R = 18
 
 def _slug(s: str) -> str:
     s = s.lower()
@@ -12,13 +18,193 @@ def _slug(s: str) -> str:
     s = re.sub(r"\s+", "-", s).strip("-")
     return s or "game"
 
-def _today_dir() -> Path:
-    d = dt.datetime.now().strftime("%Y-%m-%d")
-    p = ROOT / "output" / d
-    p.mkdir(parents=True, exist_ok=True)
-    return p
+# Runtime JS compartido por los juegos. No es un f-string: la configuración
+# llega en window.TEKTRA_GAME, así las llaves de JS no necesitan escaparse.
+#  - pool de orbes con swap-remove (sin filter/push por frame)
+#  - fondo pintado una sola vez en un canvas offscreen
+#  - grilla uniforme (listas enlazadas en typed arrays) para colisiones
+#  - HUD opcional de frame time / FPS (?hud=1 o tecla F); ?stress=N para pruebas
+#  - si hay atlas, una sola imagen y drawImage por subrect; si no, primitivas
+RUNTIME_JS = r"""
+(function(){
+'use strict';
+const CFG = window.TEKTRA_GAME;
+const cvs = document.getElementById('c');
+const ctx = cvs.getContext('2d', {alpha:false});
+const scoreEl = document.getElementById('score');
+const resetBtn = document.getElementById('reset');
+const W = cvs.width, H = cvs.height;
+const params = new URLSearchParams(location.search);
+let hudOn = CFG.hud || params.has('hud');
+const stress = Math.min(CFG.pool, parseInt(params.get('stress') || '0', 10) || 0);
+
+// --- fondo cacheado ---
+const bg = (typeof OffscreenCanvas === 'function')
+  ? new OffscreenCanvas(W, H)
+  : Object.assign(document.createElement('canvas'), {width:W, height:H});
+(function paintBg(){
+  const b = bg.getContext('2d');
+  const g = b.createLinearGradient(0, 0, 0, H);
+  g.addColorStop(0, CFG.colors.bgTop); g.addColorStop(1, CFG.colors.bgBottom);
+  b.fillStyle = g; b.fillRect(0, 0, W, H);
+})();
+
+// --- atlas de sprites (opcional) ---
+let atlas = null;
+const ORB_FRAMES = [];
+if (CFG.atlas){
+  const img = new Image();
+  img.onload = () => { atlas = img; };
+  img.src = CFG.atlas.src;
+  for (const k of ['orb', 'orb_hot', 'orb_cold']) if (CFG.atlas.frames[k]) ORB_FRAMES.push(CFG.atlas.frames[k]);
+}
+function blit(f, x, y, r){
+  ctx.drawImage(atlas, f.x, f.y, f.w, f.h, x-r-1, y-r-1, 2*r+2, 2*r+2);
+}
+
+// --- pool de entidades ---
+const pool = new Array(CFG.pool);
+for (let i = 0; i < CFG.pool; i++) pool[i] = {x:0, y:0, r:0, v:0, f:0, scored:false};
+let n = 0;
+
+function spawn(x){
+  if (n >= CFG.pool) return;
+  const o = pool[n++];
+  o.r = 8 + Math.random()*(CFG.maxR-8);
+  o.y = o.r + Math.random()*(H-2*o.r);
+  o.x = x === undefined ? W + o.r : x;
+  o.v = 2 + Math.random()*3;
+  o.f = ORB_FRAMES.length ? (Math.random()*ORB_FRAMES.length) | 0 : 0;
+  o.scored = false;
+}
+function release(i){
+  const last = --n;
+  const tmp = pool[i]; pool[i] = pool[last]; pool[last] = tmp;
+}
+
+// --- grilla uniforme (broad phase) ---
+const CELL = CFG.cell;
+const COLS = Math.ceil((W + 2*CELL) / CELL) + 1, ROWS = Math.ceil(H / CELL) + 1;
+const head = new Int32Array(COLS*ROWS);
+const next = new Int32Array(CFG.pool);
+function cellOf(x, y){
+  let cx = ((x + CELL) / CELL) | 0, cy = (y / CELL) | 0;
+  if (cx < 0) cx = 0; else if (cx >= COLS) cx = COLS-1;
+  if (cy < 0) cy = 0; else if (cy >= ROWS) cy = ROWS-1;
+  return cy*COLS + cx;
+}
+function buildGrid(){
+  head.fill(-1);
+  for (let i = 0; i < n; i++){
+    const c = cellOf(pool[i].x, pool[i].y);
+    next[i] = head[c]; head[c] = i;
+  }
+}
+function hitsPlayer(){
+  const cx = ((player.x + CELL) / CELL) | 0, cy = (player.y / CELL) | 0;
+  for (let gy = cy-1; gy <= cy+1; gy++){
+    if (gy < 0 || gy >= ROWS) continue;
+    for (let gx = cx-1; gx <= cx+1; gx++){
+      if (gx < 0 || gx >= COLS) continue;
+      for (let i = head[gy*COLS+gx]; i !== -1; i = next[i]){
+        const o = pool[i], dx = o.x-player.x, dy = o.y-player.y, rr = o.r+player.r;
+        if (dx*dx + dy*dy < rr*rr) return true;
+      }
+    }
+  }
+  return false;
+}
+
+// --- estado ---
+const player = {x:80, y:H/2, r:12, dy:0};
+let score = 0, shownScore = -1, alive = true, t = 0;
+
+function restart(){
+  n = 0; score = 0; alive = true; player.y = H/2; player.dy = 0; t = 0;
+  for (let i = 0; i < stress; i++) spawn(Math.random()*W + 200);
+}
+
+function update(step){
+  t++;
+  if (!alive) return;
+  if (t % CFG.spawnEvery === 0) spawn();
+  if (stress && n < stress) spawn();
+  player.dy *= 0.98;
+  player.y += player.dy*step;
+  if (player.y < player.r) player.y = player.r;
+  else if (player.y > H-player.r) player.y = H-player.r;
+  for (let i = n-1; i >= 0; i--){
+    const o = pool[i];
+    o.x -= o.v*step;
+    if (o.x < -o.r - 2){ release(i); continue; }
+    if (!o.scored && o.x < player.x){ o.scored = true; score++; }
+  }
+  buildGrid();
+  if (hitsPlayer()) alive = false;
+}
+
+// --- HUD de frame time ---
+const SAMPLES = 120;
+const frameMs = new Float32Array(SAMPLES);
+let fIdx = 0, fCount = 0, hudText = '', hudNext = 0;
+function sampleFrame(ms, now){
+  frameMs[fIdx] = ms; fIdx = (fIdx+1) % SAMPLES; if (fCount < SAMPLES) fCount++;
+  if (!hudOn || now < hudNext) return;
+  hudNext = now + 250;
+  let sum = 0, worst = 0;
+  for (let i = 0; i < fCount; i++){ sum += frameMs[i]; if (frameMs[i] > worst) worst = frameMs[i]; }
+  const avg = sum / fCount;
+  hudText = (1000/avg).toFixed(0) + ' fps  ' + avg.toFixed(1) + ' ms  max ' + worst.toFixed(1) + ' ms  ' + n + ' ent';
+}
 
-def generate_game():
+function render(){
+  ctx.drawImage(bg, 0, 0);
+  if (atlas && ORB_FRAMES.length){
+    blit(CFG.atlas.frames.player || ORB_FRAMES[0], player.x, player.y, player.r);
+    for (let i = 0; i < n; i++){ const o = pool[i]; blit(ORB_FRAMES[o.f], o.x, o.y, o.r); }
+  } else {
+    ctx.fillStyle = CFG.colors.player;
+    ctx.beginPath(); ctx.arc(player.x, player.y, player.r, 0, Math.PI*2); ctx.fill();
+    // todos los orbes en un único path: un solo fill por frame
+    ctx.fillStyle = CFG.colors.orb;
+    ctx.beginPath();
+    for (let i = 0; i < n; i++){
+      const o = pool[i];
+      ctx.moveTo(o.x+o.r, o.y); ctx.arc(o.x, o.y, o.r, 0, Math.PI*2);
+    }
+    ctx.fill();
+  }
+  if (!alive){ ctx.fillStyle = CFG.colors.player; ctx.fillText('Perdiste — Enter para reiniciar', W/2-110, H/2); }
+  if (hudOn){
+    ctx.fillStyle = '#000a'; ctx.fillRect(W-250, 6, 244, 20);
+    ctx.fillStyle = '#7dff9a'; ctx.fillText(hudText, W-244, 20);
+  }
+  if (score !== shownScore){ shownScore = score; scoreEl.textContent = score; }
+}
+
+let last = performance.now();
+function loop(now){
+  const ms = now - last; last = now;
+  update(Math.min(ms, 50) / (1000/60));
+  render();
+  sampleFrame(ms, now);
+  requestAnimationFrame(loop);
+}
+
+window.addEventListener('keydown', e => {
+  if (e.code === 'Space') player.dy -= 4;
+  if (e.code === 'Enter' && !alive) restart();
+  if (e.code === 'KeyF') hudOn = !hudOn;
+});
+resetBtn.onclick = () => restart();
+
+ctx.font = '12px system-ui';
+restart();
+requestAnimationFrame(loop);
+})();
+"""
+
+def generate_game(show_hud: bool = False):
     """
     Genera un juego simple (index.html con canvas + JS embebido)
     en output/<YYYY-MM-DD>/game_<slug>_<timestamp>/
@@ -27,8 +213,28 @@ def generate_game():
     title = "Tektra — Orb Runner"
     slug = _slug(title)
     stamp = dt.datetime.now().strftime("%H%M%S")
-    out = _today_dir() / f"game_{slug}_{stamp}"
-    out.mkdir(parents=True, exist_ok=True)
+    day = dt.datetime.now().strftime("%Y-%m-%d")
+    rel = f"{day}/game_{slug}_{stamp}"
+    out = output_root() / rel
+
+    atlas, frame_map, assets = None, None, []
+    built = build_atlas(ORB_RUNNER_SPRITES)
+    if built:
+        # el PNG va dentro del juego (assets/<hash>.png): se publica junto con el index.html
+        frame_map, png = built
+        src = f"assets/{frame_map['meta']['image']}"
+        atlas = {"src": src, "frames": frame_map["frames"]}
+        assets.append((f"{rel}/{src}", png))
+
+    cfg = {
+        "pool": POOL_SIZE,
+        "cell": GRID_CELL,
+        "maxR": MAX_ORB_R,
+        "spawnEvery": 50,
+        "hud": show_hud,
+        "atlas": atlas,
+        "colors": {"bgTop": "#0b0b0f", "bgBottom": "#7a5cff", "player": "#eaeaf2", "orb": "#111"},
+    }
 
     html = f"""<!doctype html>
 <html lang="es">
@@ -46,84 +252,24 @@ def generate_game():
 <body>
 <div id="hud">Puntos: <span id="score">0</span> · <button id="reset">Reiniciar</button></div>
 <canvas id="c" width="720" height="420"></canvas>
-<script>
-const cvs = document.getElementById('c');
-const ctx = cvs.getContext('2d');
-const scoreEl = document.getElementById('score');
-const resetBtn = document.getElementById('reset');
-
-let player={{x:80,y:cvs.height/2,r:12,dy:0}};
-let orbs=[];
-let score=0, alive=true, t=0;
-
-function spawn(){
-  const y = 60 + Math.random()*(cvs.height-120);
-  const r = 8 + Math.random()*10;
-  const v = 2 + Math.random()*3;
-  orbs.push({x:cvs.width+20,y,r,v});
-}
-
-function loop(){
-  t++;
-  if(alive){ 
-    if(t%50===0) spawn();
-    player.dy *= 0.98;
-    player.y += player.dy;
-    player.y = Math.max(player.r, Math.min(cvs.height-player.r, player.y));
-    orbs.forEach(o=>o.x-=o.v);
-    orbs = orbs.filter(o=>o.x>-20);
-    // colisiones
-    for(const o of orbs){
-      const dx = o.x-player.x, dy=o.y-player.y;
-      if(Math.hypot(dx,dy) < o.r+player.r){ alive=false; break; }
-      if(o.x<player.x && !o.scored){ o.scored=true; score++; scoreEl.textContent=score; }
-    }
-  }
-
-  // render
-  ctx.clearRect(0,0,cvs.width,cvs.height);
-  // fondo gradiente
-  const g=ctx.createLinearGradient(0,0,0,cvs.height);
-  g.addColorStop(0,'#0b0b0f'); g.addColorStop(1,'#7a5cff');
-  ctx.fillStyle=g; ctx.fillRect(0,0,cvs.width,cvs.height);
-
-  // player
-  ctx.beginPath(); ctx.fillStyle='#eaeaf2';
-  ctx.arc(player.x,player.y,player.r,0,Math.PI*2); ctx.fill();
-
-  // orbs
-  ctx.fillStyle='#111';
-  orbs.forEach(o=>{{ctx.beginPath();ctx.arc(o.x,o.y,o.r,0,Math.PI*2);ctx.fill();}});
-
-  if(!alive){ ctx.fillStyle='#eaeaf2'; ctx.fillText('Perdiste — Enter para reiniciar', cvs.width/2-110, cvs.height/2); }
-  requestAnimationFrame(loop);
-}
-
-window.addEventListener('keydown',e=>{{
-  if(e.code==='Space') player.dy -= 4;
-  if(e.code==='Enter' && !alive) restart();
-}});
-resetBtn.onclick = ()=>restart();
-
-function restart(){{
-  orbs=[]; score=0; scoreEl.textContent=0; alive=true; player.y=cvs.height/2; player.dy=0; t=0;
-}}
-
-loop();
-</script>
+<script>window.TEKTRA_GAME = {json.dumps(cfg)};</script>
+<script>{RUNTIME_JS}</script>
 </body>
 </html>
 """
-    (out / "index.html").write_text(html, encoding="utf-8")
-
     meta = {
         "type": "game",
         "title": title,
         "created_at": dt.datetime.now().isoformat(),
         "path": str(out),
-        "controls": "Barra espaciadora para subir. Enter o botón para reiniciar.",
-        "win_condition": "Superar tantos orbes como sea posible (score)."
+        "controls": "Barra espaciadora para subir. Enter o botón para reiniciar. F muestra el HUD de rendimiento.",
+        "win_condition": "Superar tantos orbes como sea posible (score).",
+        "runtime": {"pool_size": POOL_SIZE, "grid_cell": GRID_CELL, "hud": show_hud},
+        "atlas": frame_map["meta"]["hash"] if frame_map else None,
     }
-    (out / "metadata.json").write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+    get_writer().write_item([
+        (f"{rel}/index.html", html),
+        (f"{rel}/metadata.json", json.dumps(meta, ensure_ascii=False, indent=2)),
+        *assets,
+    ])
     return str(out)
-
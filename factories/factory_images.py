@@ -7,10 +7,11 @@ Image Factory para Tektra - Genera prompts épicos para imágenes
 
 import random
 import datetime as dt
-from pathlib import Path
 import json
 import logging
 
+from factories.writer import get_writer
+
 log = logging.getLogger("tektra.image_factory")
 
 # Estilos artísticos épicos
@@ -132,14 +133,6 @@ def generate_image() -> str:
         
         filename = f"img_{subject_slug}_{timestamp}.txt"
         
-        # Crear carpeta de salida
-        output_dir = Path(__file__).parent.parent / "output" / today
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Guardar el prompt en un archivo de texto
-        prompt_file = output_dir / filename
-        prompt_file.write_text(prompt, encoding="utf-8")
-        
         # Generar metadata detallada
         metadata = {
             "type": "image_prompt",
@@ -157,13 +150,6 @@ def generate_image() -> str:
             "estimated_tokens": len(prompt.split())
         }
         
-        # Guardar metadata
-        metadata_file = output_dir / f"{filename.replace('.txt', '_metadata.json')}"
-        metadata_file.write_text(
-            json.dumps(metadata, ensure_ascii=False, indent=2),
-            encoding="utf-8"
-        )
-        
         # Generar README con instrucciones
         readme_content = f"""# Image Prompt: {subject_slug.replace('_', ' ').title()}
 
@@ -195,14 +181,18 @@ def generate_image() -> str:
 Generated by **Tektra** - The autonomous digital craftsman ⚡
 """
         
-        readme_file = output_dir / f"{filename.replace('.txt', '_README.md')}"
-        readme_file.write_text(readme_content, encoding="utf-8")
+        # Metadata y README primero: cuando aparece el .txt el trío ya está completo
+        get_writer().write_item([
+            (f"{today}/{filename.replace('.txt', '_metadata.json')}", json.dumps(metadata, ensure_ascii=False, indent=2)),
+            (f"{today}/{filename.replace('.txt', '_README.md')}", readme_content),
+            (f"{today}/{filename}", prompt),
+        ])
         
-        log.info(f"Prompt de imagen generado: {subject_slug}")
+        log.info("Prompt de imagen generado: %s", subject_slug)
         return f"Prompt '{subject_slug}' generado en {filename}"
         
     except Exception as e:
-        log.error(f"Error generando prompt de imagen: {e}")
+        log.error("Error generando prompt de imagen: %s", e)
         raise
 
 def generate_batch_prompts(count: int = 5) -> list:
@@ -213,7 +203,7 @@ def generate_batch_prompts(count: int = 5) -> list:
             result = generate_image()
             results.append(result)
         except Exception as e:
-            log.error(f"Error generando prompt {i+1}/{count}: {e}")
+            log.error("Error generando prompt %d/%d: %s", i + 1, count, e)
             results.append(f"Error en prompt {i+1}: {str(e)}")
     return results
 
@@ -271,11 +261,7 @@ def generate_themed_image(theme: str) -> str:
     timestamp = dt.datetime.now().strftime("%H%M%S")
     filename = f"img_{theme}_{timestamp}.txt"
     
-    output_dir = Path(__file__).parent.parent / "output" / today
-    output_dir.mkdir(parents=True, exist_ok=True)
-    
-    prompt_file = output_dir / filename
-    prompt_file.write_text(prompt, encoding="utf-8")
+    get_writer().write_item([(f"{today}/{filename}", prompt)])
     
-    log.info(f"Prompt temático '{theme}' generado")
+    log.info("Prompt temático '%s' generado", theme)
     return f"Prompt temático '{theme}' generado en {filename}"
@@ -7,10 +7,13 @@ Web Factory para Tektra - Genera sitios web completos y creativos
 
 import random
 import datetime as dt
-from pathlib import Path
+from html import escape
 import json
 import logging
 
+from factories.utils import output_root, build_contacts, image_for
+from factories.writer import get_writer
+
 log = logging.getLogger("tektra.web_factory")
 
 # Paletas de colores épicas
@@ -71,6 +74,8 @@ SITE_CONCEPTS = [
     {"name": "Urban Explorer Co.", "theme": "travel", "desc": "City adventure guides"}
 ]
 
+TEAM_ROLES = ["Founder", "Creative Director", "Lead Engineer", "Community Manager", "Product Designer"]
+
 def generate_site() -> str:
     """Genera un sitio web completo y creativo"""
     try:
@@ -82,36 +87,35 @@ def generate_site() -> str:
         today = dt.datetime.now().strftime("%Y-%m-%d")
         site_name = concept["name"].lower().replace(" ", "_")
         
-        output_dir = Path(__file__).parent.parent / "output" / today
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
+        output_dir = output_root() / today
         site_dir = output_dir / f"web_{site_name}"
-        site_dir.mkdir(exist_ok=True)
+        rel = f"{today}/web_{site_name}"
         
+        # Equipo con avatares locales: los archivos van en assets/ del propio sitio
+        assets = {}
+        team = build_contacts([{"role": r} for r in random.sample(TEAM_ROLES, 3)], assets=assets)
+        # Imágenes con seed fija por (sitio, paleta): regenerar el sitio reusa el cache de placeholders
+        seed = f"{site_name}:{palette['name']}"
+        images = {
+            "hero": image_for(1200, 600, f"{seed}:hero", assets=assets),
+            "services": [image_for(600, 360, f"{seed}:service{i}", assets=assets) for i in range(3)],
+        }
+
         # Generar archivos del sitio
-        html_content = generate_html(concept, palette)
+        html_content = generate_html(concept, palette, team=team, images=images)
         css_content = generate_css(palette)
         js_content = generate_js(concept)
         
-        # Escribir archivos
-        (site_dir / "index.html").write_text(html_content, encoding="utf-8")
-        (site_dir / "styles.css").write_text(css_content, encoding="utf-8")
-        (site_dir / "script.js").write_text(js_content, encoding="utf-8")
-        
         # Generar metadata
         metadata = {
             "type": "website",
             "concept": concept,
             "palette": palette,
             "created_at": dt.datetime.utcnow().isoformat() + "Z",
-            "files": ["index.html", "styles.css", "script.js"]
+            "files": ["index.html", "styles.css", "script.js"],
+            "assets": sorted(assets)
         }
         
-        (site_dir / "metadata.json").write_text(
-            json.dumps(metadata, ensure_ascii=False, indent=2), 
-            encoding="utf-8"
-        )
-        
         # Generar README
         readme_content = f"""# {concept['name']}
 
@@ -131,17 +135,50 @@ def generate_site() -> str:
 Abre `index.html` en tu navegador para ver el sitio.
 """
         
-        (site_dir / "README.md").write_text(readme_content, encoding="utf-8")
+        # Escribir el sitio completo de una vez (aparece con un solo rename)
+        get_writer().write_item([
+            (f"{rel}/index.html", html_content),
+            (f"{rel}/styles.css", css_content),
+            (f"{rel}/script.js", js_content),
+            (f"{rel}/metadata.json", json.dumps(metadata, ensure_ascii=False, indent=2)),
+            (f"{rel}/README.md", readme_content),
+            *((f"{rel}/{path}", data) for path, data in assets.items()),
+        ])
         
-        log.info(f"Sitio web generado: {concept['name']} con paleta {palette['name']}")
+        log.info("Sitio web generado: %s con paleta %s", concept["name"], palette["name"])
         return f"Sitio '{concept['name']}' generado en {site_dir.relative_to(output_dir.parent)}"
         
     except Exception as e:
-        log.error(f"Error generando sitio web: {e}")
+        log.error("Error generando sitio web: %s", e)
         raise
 
-def generate_html(concept: dict, palette: dict) -> str:
+def generate_team(team: list) -> str:
+    """Sección de equipo (contactos de build_contacts)"""
+    cards = "".join(f"""
+                    <div class="team-card">
+                        <img src="{escape(m['avatar'])}" alt="{escape(m['name'])}" loading="lazy">
+                        <h3>{escape(m['name'])}</h3>
+                        <p>{escape(m.get('role', ''))}</p>
+                        <a href="mailto:{escape(m['email'])}">{escape(m['email'])}</a>
+                    </div>""" for m in team)
+    return f"""
+        <section id="team" class="section team-section">
+            <div class="container">
+                <h2 class="section-title">Our Team</h2>
+                <div class="team-grid">{cards}
+                </div>
+            </div>
+        </section>
+"""
+
+def generate_html(concept: dict, palette: dict, team: list | None = None, images: dict | None = None) -> str:
     """Genera el HTML del sitio"""
+    images = images or {}
+    team_section = generate_team(team) if team else ""
+    hero_image = f'<img class="hero-image" src="{escape(images["hero"])}" alt="">' if images.get("hero") else ""
+    service_images = [f'<img class="service-image" src="{escape(src)}" alt="" loading="lazy">\n                        '
+                      for src in images.get("services", [])] + [""] * 3
+    team_link = '<a href="#team">Team</a>' if team else ""
     return f"""<!DOCTYPE html>
 <html lang="es">
 <head>
@@ -158,6 +195,7 @@ def generate_html(concept: dict, palette: dict) -> str:
             <div class="nav-menu">
                 <a href="#about">About</a>
                 <a href="#services">Services</a>
+                {team_link}
                 <a href="#contact">Contact</a>
             </div>
         </nav>
@@ -169,6 +207,7 @@ def generate_html(concept: dict, palette: dict) -> str:
         </div>
         
         <div class="hero-visual">
+            {hero_image}
             <div class="floating-elements">
                 <div class="element element-1"></div>
                 <div class="element element-2"></div>
@@ -206,24 +245,24 @@ def generate_html(concept: dict, palette: dict) -> str:
                 <h2 class="section-title">Our Services</h2>
                 <div class="services-grid">
                     <div class="service-card">
-                        <h3>Premium {concept['theme'].title()}</h3>
+                        {service_images[0]}<h3>Premium {concept['theme'].title()}</h3>
                         <p>Experience the future of {concept['theme']} with our innovative solutions.</p>
                         <div class="service-price">Starting at $299</div>
                     </div>
                     <div class="service-card featured">
-                        <h3>Elite Package</h3>
+                        {service_images[1]}<h3>Elite Package</h3>
                         <p>Complete {concept['theme']} transformation with personal consultation.</p>
                         <div class="service-price">Starting at $599</div>
                     </div>
                     <div class="service-card">
-                        <h3>Custom Solutions</h3>
+                        {service_images[2]}<h3>Custom Solutions</h3>
                         <p>Tailored {concept['theme']} experiences designed just for you.</p>
                         <div class="service-price">Contact Us</div>
                     </div>
                 </div>
             </div>
         </section>
-
+{team_section}
         <section id="contact" class="section contact-section">
             <div class="container">
                 <h2 class="section-title">Get In Touch</h2>
@@ -429,6 +468,15 @@ body {{
     z-index: 1;
 }}
 
+.hero-image {{
+    position: absolute;
+    inset: 0;
+    width: 100%;
+    height: 100%;
+    object-fit: cover;
+    opacity: 0.35;
+}}
+
 .floating-elements {{
     position: relative;
     width: 100%;
@@ -542,6 +590,15 @@ body {{
     box-shadow: var(--shadow);
 }}
 
+.service-image {{
+    display: block;
+    width: 100%;
+    aspect-ratio: 5 / 3;
+    object-fit: cover;
+    border-radius: 12px;
+    margin-bottom: 1.5rem;
+}}
+
 .service-card h3 {{
     color: var(--primary);
     margin-bottom: 1rem;
@@ -555,6 +612,38 @@ body {{
     margin-top: 1rem;
 }}
 
+/* Team Section */
+.team-grid {{
+    display: grid;
+    grid-template-columns: repeat(auto-fit, minmax(220px, 1fr));
+    gap: 2rem;
+    margin-top: 2rem;
+}}
+
+.team-card {{
+    background: var(--card-bg);
+    padding: 2rem;
+    border-radius: 20px;
+    text-align: center;
+    border: 1px solid var(--primary)30;
+}}
+
+.team-card img {{
+    width: 96px;
+    height: 96px;
+    border-radius: 50%;
+    margin-bottom: 1rem;
+}}
+
+.team-card h3 {{
+    color: var(--primary);
+}}
+
+.team-card a {{
+    color: var(--secondary);
+    font-size: 0.9rem;
+}}
+
 /* Contact Section */
 .contact-grid {{
     display: grid;
@@ -865,3 +954,8 @@ document.addEventListener('DOMContentLoaded', function() {{
 
     // Create particles periodically
     setInterval(
+        createParticle,
+        3000
+    );
+}});
+"""
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Imágenes placeholder locales (reemplazo de picsum.photos).
+
+Un degradado de dos colores con manchas suaves de ruido, derivado de
+(ancho, alto, seed), codificado como WebP (o JPEG si Pillow no trae WebP).
+Se cachean en <output>/_placeholders/ y además en memoria por proceso.
+Sin NumPy/Pillow se genera un SVG con el mismo degradado.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+import colorsys
+import hashlib
+import io
+
+from factories import diskcache
+
+try:
+    import numpy as np
+    from PIL import Image, features
+except ImportError:
+    np = None
+
+PLACEHOLDER_SUBDIR = "_placeholders"
+PLACEHOLDER_VERSION = 2
+# el degradado se calcula a 1/RENDER_SCALE del tamaño final y se escala con
+# bicúbica: es suave, no se nota, y cuesta RENDER_SCALE² veces menos
+RENDER_SCALE = 4
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+def _params(width: int, height: int, seed) -> tuple:
+    d = hashlib.sha256(f"{width}x{height}:{seed}".encode("utf-8")).digest()
+    h1 = d[0] / 255
+    h2 = (h1 + 0.15 + d[1] / 255 * 0.35) % 1.0
+    c1 = tuple(int(v * 255) for v in colorsys.hls_to_rgb(h1, 0.45, 0.65))
+    c2 = tuple(int(v * 255) for v in colorsys.hls_to_rgb(h2, 0.60, 0.70))
+    angle = d[2] / 255 * 360
+    return d, c1, c2, angle
+
+def _format() -> str:
+    return "webp" if np is not None and features.check("webp") else ("jpg" if np is not None else "svg")
+
+def render_raster(width: int, height: int, seed, fmt: str) -> bytes:
+    d, c1, c2, angle = _params(width, height, seed)
+    rng = np.random.default_rng(int.from_bytes(d[:8], "little"))
+    rad = np.deg2rad(angle)
+    w, h = max(width // RENDER_SCALE, 1), max(height // RENDER_SCALE, 1)
+    x = np.arange(w, dtype=np.float32)[None, :]
+    y = np.arange(h, dtype=np.float32)[:, None]
+    t = x / w * np.cos(rad) + y / h * np.sin(rad)
+    t = (t - t.min()) / max(float(t.max() - t.min()), 1e-6)
+    # ruido de baja frecuencia: grilla chica escalada con bicúbica (comprime bien)
+    blobs = Image.fromarray((rng.random((6, 8)) * 255).astype(np.uint8)).resize((w, h), Image.BICUBIC)
+    t = np.clip(t + (np.asarray(blobs, dtype=np.float32) / 255 - 0.5) * 0.35, 0, 1)[..., None]
+    rgb = np.asarray(c1, np.float32) * (1 - t) + np.asarray(c2, np.float32) * t
+    img = Image.fromarray(rgb.astype(np.uint8), "RGB").resize((width, height), Image.BICUBIC)
+    buf = io.BytesIO()
+    if fmt == "webp":
+        # method 1: en un degradado el encoder lento casi no achica el archivo
+        img.save(buf, "WEBP", quality=70, method=1)
+    else:
+        img.save(buf, "JPEG", quality=80, optimize=True, progressive=True)
+    return buf.getvalue()
+
+def render_svg(width: int, height: int, seed) -> bytes:
+    _, c1, c2, angle = _params(width, height, seed)
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}">'
+            f'<defs><linearGradient id="g" gradientTransform="rotate({angle:.0f} .5 .5)">'
+            f'<stop offset="0" stop-color="rgb{c1}"/><stop offset="1" stop-color="rgb{c2}"/></linearGradient></defs>'
+            f'<rect width="100%" height="100%" fill="url(#g)"/></svg>').encode("utf-8")
+
+@lru_cache(maxsize=256)
+def _memo(root: Path, width: int, height: int, seed) -> tuple[str, bytes]:
+    # root es parte de la clave: si cambia output_root() se vuelve a pasar por el cache de esa raíz
+    fmt = _format()
+    key = f"v{PLACEHOLDER_VERSION}:{width}x{height}:{seed}:{fmt}"
+    cache = diskcache.for_output(PLACEHOLDER_SUBDIR, MAX_CACHE_BYTES)
+    if fmt == "svg":
+        return cache.fetch(key, fmt, lambda: render_svg(width, height, seed))
+    return cache.fetch(key, fmt, lambda: render_raster(width, height, seed, fmt))
+
+def placeholder_file(width: int = 1200, height: int = 800, seed=None) -> tuple[str, bytes]:
+    """(nombre de archivo, bytes) de la imagen para (ancho, alto, seed); la renderiza si no existe"""
+    return _memo(diskcache.for_output(PLACEHOLDER_SUBDIR, MAX_CACHE_BYTES).root, width, height, seed)
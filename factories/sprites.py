@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Atlas de sprites para los juegos de Tektra.
+
+Los sprites se renderizan proceduralmente con Pillow, se empaquetan con un
+skyline bottom-left en un único PNG y se describe cada subrect en un JSON
+de frames. El atlas se cachea por hash del set de sprites: dos juegos con el
+mismo set no lo vuelven a renderizar, y cada uno lleva su copia del PNG.
+"""
+
+import hashlib
+import io
+import json
+import logging
+
+try:
+    from PIL import Image, ImageDraw, ImageFilter
+except ImportError:
+    Image = None
+
+from factories.writer import get_writer
+
+log = logging.getLogger("tektra.sprites")
+
+ATLAS_SUBDIR = "_atlas"
+ATLAS_VERSION = 1   # subir si cambia el renderer: invalida los atlas cacheados
+PADDING = 2
+SUPERSAMPLE = 4
+
+# Set de sprites del Orb Runner (radio en px del sprite final)
+ORB_RUNNER_SPRITES = [
+    {"name": "player",   "shape": "glow",  "r": 14, "color": "#eaeaf2", "glow": "#7a5cff"},
+    {"name": "orb",      "shape": "orb",   "r": 18, "color": "#111111", "rim": "#7a5cff"},
+    {"name": "orb_hot",  "shape": "orb",   "r": 18, "color": "#1a0b12", "rim": "#ff4f8b"},
+    {"name": "orb_cold", "shape": "orb",   "r": 18, "color": "#0b1420", "rim": "#38bdf8"},
+    {"name": "spark",    "shape": "glow",  "r": 6,  "color": "#ffffff", "glow": "#ffd23f"},
+]
+
+def _rgba(hex_color: str, alpha: int = 255) -> tuple:
+    h = hex_color.lstrip("#")
+    return (int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16), alpha)
+
+def render_sprite(spec: dict):
+    """Renderiza un sprite (RGBA) a partir de su spec, con antialias por supersampling"""
+    r = spec["r"]
+    size = 2 * r + 2
+    big = size * SUPERSAMPLE
+    img = Image.new("RGBA", (big, big), (0, 0, 0, 0))
+    d = ImageDraw.Draw(img)
+    c = big / 2
+    R = r * SUPERSAMPLE
+    if spec["shape"] == "glow":
+        halo = Image.new("RGBA", (big, big), (0, 0, 0, 0))
+        ImageDraw.Draw(halo).ellipse((c - R, c - R, c + R, c + R), fill=_rgba(spec["glow"], 160))
+        img = halo.filter(ImageFilter.GaussianBlur(R * 0.25))
+        d = ImageDraw.Draw(img)
+        core = R * 0.7
+        d.ellipse((c - core, c - core, c + core, c + core), fill=_rgba(spec["color"]))
+    else:
+        d.ellipse((c - R, c - R, c + R, c + R), fill=_rgba(spec["rim"]))
+        inner = R - 2 * SUPERSAMPLE
+        d.ellipse((c - inner, c - inner, c + inner, c + inner), fill=_rgba(spec["color"]))
+        hl = R * 0.3
+        d.ellipse((c - R * 0.5 - hl / 2, c - R * 0.5 - hl / 2, c - R * 0.5 + hl / 2, c - R * 0.5 + hl / 2),
+                  fill=_rgba(spec["rim"], 140))
+    return img.resize((size, size), Image.LANCZOS)
+
+def _next_pow2(n: int) -> int:
+    p = 1
+    while p < n:
+        p <<= 1
+    return p
+
+def pack_skyline(sizes: list, width: int) -> list:
+    """
+    Empaqueta rectángulos (w, h) con skyline bottom-left en un ancho fijo.
+    Devuelve una lista de (x, y) en el mismo orden que `sizes`.
+    """
+    skyline = [[0, 0, width]]   # segmentos [x, y, w]
+    placed = [None] * len(sizes)
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    for idx in order:
+        w, h = sizes[idx]
+        best = None   # (top, ancho_del_segmento, i, x, y)
+        for i, (x, _, seg_w) in enumerate(skyline):
+            if x + w > width:
+                break
+            # y = máximo de los segmentos que cubre el rectángulo
+            y, covered, j = 0, 0, i
+            while covered < w:
+                y = max(y, skyline[j][1])
+                covered += skyline[j][2]
+                j += 1
+            cand = (y + h, seg_w, i, x, y)
+            if best is None or cand[:2] < best[:2]:
+                best = cand
+        if best is None:
+            raise ValueError(f"Sprite de {w}x{h} no entra en un atlas de ancho {width}")
+        _, _, i, x, y = best
+        placed[idx] = (x, y)
+        # insertar el nuevo segmento y recortar los que quedaron debajo
+        skyline.insert(i, [x, y + h, w])
+        j = i + 1
+        while j < len(skyline):
+            seg = skyline[j]
+            end = x + w
+            if seg[0] >= end:
+                break
+            shrink = end - seg[0]
+            if shrink >= seg[2]:
+                skyline.pop(j)
+                continue
+            seg[0] += shrink
+            seg[2] -= shrink
+            break
+        # fusionar segmentos contiguos a la misma altura
+        k = 0
+        while k < len(skyline) - 1:
+            if skyline[k][1] == skyline[k + 1][1]:
+                skyline[k][2] += skyline.pop(k + 1)[2]
+            else:
+                k += 1
+    return placed
+
+def sprite_set_hash(specs: list) -> str:
+    blob = json.dumps({"v": ATLAS_VERSION, "specs": specs}, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(blob).hexdigest()[:16]
+
+def build_atlas(specs: list = ORB_RUNNER_SPRITES):
+    """
+    Devuelve (frame map, bytes del PNG) del atlas para `specs`, generándolo
+    solo si no existe en el cache (_atlas/<hash>.png + <hash>.json, escritos
+    con el writer del proceso: en --dry-run quedan en memoria). Cada juego
+    lleva su copia del PNG; el cache solo evita volver a renderizarlo.
+    Retorna None si Pillow no está instalado.
+    """
+    writer = get_writer()
+    digest = sprite_set_hash(specs)
+    png_rel, json_rel = f"{ATLAS_SUBDIR}/{digest}.png", f"{ATLAS_SUBDIR}/{digest}.json"
+    cached, png = writer.read(json_rel), writer.read(png_rel)
+    if cached is not None and png is not None:
+        return json.loads(cached), png
+    if Image is None:
+        log.warning("Pillow no disponible: el juego usará primitivas de canvas")
+        return None
+
+    images = [render_sprite(s) for s in specs]
+    sizes = [(im.width + PADDING, im.height + PADDING) for im in images]
+    area = sum(w * h for w, h in sizes)
+    width = _next_pow2(max(max(w for w, _ in sizes), int((area ** 0.5) * 1.2)))
+    placed = pack_skyline(sizes, width)
+    height = max(y + h for (_, y), (_, h) in zip(placed, sizes))
+
+    atlas = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    frames = {}
+    for spec, im, (x, y) in zip(specs, images, placed):
+        atlas.paste(im, (x, y))
+        frames[spec["name"]] = {"x": x, "y": y, "w": im.width, "h": im.height}
+
+    frame_map = {
+        "meta": {"image": f"{digest}.png", "size": {"w": width, "h": height}, "hash": digest},
+        "frames": frames,
+    }
+    buf = io.BytesIO()
+    atlas.save(buf, format="PNG", optimize=True)
+    png = buf.getvalue()
+    writer.write_item([(png_rel, png), (json_rel, json.dumps(frame_map, ensure_ascii=False, indent=2))])
+    log.info("Atlas %s generado (%dx%d, %d sprites)", digest, width, height, len(specs))
+    return frame_map, png
@@ -1,34 +1,191 @@
+import base64
 import re
 import random
+import threading
+import unicodedata
+from collections import deque
 from urllib.parse import quote
 
+import config
+
 try:
     from faker import Faker
 except ImportError:
     Faker = None
 
+# se resuelve en cada llamada: sigue a TEKTRA_OUTPUT y a las recargas de config.yaml
+output_root = config.output_root
+
 GENERIC_DOMAINS = {'gmail.com', 'hotmail.com', 'yahoo.com'}
+DEFAULT_DOMAINS = ["example.com", "studio.com", "designco.io", "techhub.dev", "makerstudio.ai"]
+_RESERVED_LOCAL = re.compile(r"^(hola|user|admin)@", re.I)
+_LOCAL_PART_JUNK = re.compile(r"[^a-z0-9.-]+")
+
+# construir Faker es caro (carga providers y locales): una instancia por locale y por proceso
+_fakers = {}
+_fakers_lock = threading.Lock()
+
+def get_faker(locale=None):
+    if Faker is None:
+        return None
+    fk = _fakers.get(locale)
+    if fk is None:
+        with _fakers_lock:
+            fk = _fakers.get(locale)
+            if fk is None:
+                fk = _fakers[locale] = Faker(locale) if locale else Faker()
+    return fk
 
 def _fake():
-    return Faker() if Faker else None
+    return get_faker()
+
+_FALLBACK_FIRST = ["Alex", "Sofia", "Mateo", "Lucia", "Diego", "Valentina", "Tomas", "Camila"]
+_FALLBACK_LAST = ["Ramos", "Garcia", "Perez", "Lopez", "Torres", "Castro", "Morales", "Silva"]
+_FALLBACK_COMPANY = ["Nova Studio", "Pixel Forge", "Orbital Labs", "Maker Studio", "Techhub"]
+
+class IdentityPool:
+    """
+    Buffer de identidades (nombre, apellido, empresa) generadas en lote.
+    take() es O(1); cuando el buffer baja de low_water se rellena en un hilo aparte.
+    """
+
+    def __init__(self, locale=None, batch=512, low_water=128):
+        self.locale, self.batch, self.low_water = locale, batch, low_water
+        self._buf = deque()
+        self._lock = threading.Lock()
+        self._refilling = False
+
+    def _generate(self, n):
+        fk = get_faker(self.locale)
+        if fk is None:
+            return [(random.choice(_FALLBACK_FIRST), random.choice(_FALLBACK_LAST), random.choice(_FALLBACK_COMPANY))
+                    for _ in range(n)]
+        first, last, company = fk.first_name, fk.last_name, fk.company
+        return [(first(), last(), company()) for _ in range(n)]
+
+    def _refill(self):
+        try:
+            batch = self._generate(self.batch)
+            self._buf.extend(batch)
+        finally:
+            with self._lock:
+                self._refilling = False
+
+    def take(self):
+        try:
+            ident = self._buf.popleft()
+        except IndexError:
+            # buffer vacío (primer uso o consumo más rápido que el relleno): un lote en este hilo
+            self._buf.extend(self._generate(self.batch))
+            ident = self._buf.popleft()
+        if len(self._buf) < self.low_water:
+            with self._lock:
+                start = not self._refilling
+                self._refilling = True
+            if start:
+                threading.Thread(target=self._refill, name="tektra-identities", daemon=True).start()
+        return ident
+
+_pools = {}
+
+def identity(locale=None):
+    """(nombre, apellido, empresa) desde el pool del locale"""
+    pool = _pools.get(locale)
+    if pool is None:
+        with _fakers_lock:
+            pool = _pools.setdefault(locale, IdentityPool(locale))
+    return pool.take()
+
+def _needs_rewrite(raw_email, forbidden=GENERIC_DOMAINS):
+    if not raw_email or "@" not in raw_email or _RESERVED_LOCAL.match(raw_email):
+        return True
+    return raw_email.rpartition("@")[2].lower() in forbidden
 
 def sanitize_email(raw_email, first_name=None, last_name=None, preferred_domains=None):
-    preferred_domains = preferred_domains or ["example.com","studio.com","designco.io","techhub.dev","makerstudio.ai"]
-    invalid = (
-        not raw_email
-        or re.match(r"^(hola|user|admin)@", raw_email or "", re.I)
-        or (raw_email and raw_email.split("@")[-1].lower() in GENERIC_DOMAINS)
-        or ("@" not in raw_email)
-    )
-    if invalid:
-        fk = _fake()
-        first = (first_name or (fk.first_name() if fk else "alex")).lower()
-        last  = (last_name  or (fk.last_name()  if fk else "ramos")).lower()
+    preferred_domains = preferred_domains or DEFAULT_DOMAINS
+    if _needs_rewrite(raw_email):
+        if not (first_name and last_name):
+            ident = identity()
+            first_name, last_name = first_name or ident[0], last_name or ident[1]
+        first, last = first_name.lower(), last_name.lower()
         domain = random.choice(preferred_domains)
         return f"{first}.{last}@{domain}"
     return raw_email
 
-def avatar_for(name, provider="dicebear"):
+def build_contacts(raw_contacts, preferred_domains=None, forbidden_domains=None,
+                   avatar_provider=None, assets=None, rng=None):
+    """
+    Sanea una lista de contactos en una pasada: completa nombres desde el pool
+    de identidades, reescribe los emails inválidos o de dominios prohibidos,
+    garantiza direcciones únicas dentro de la lista y agrega el avatar (los
+    avatares locales se agregan a `assets`, ver avatar_for).
+    Cada contacto es un dict con name / first_name / last_name / email (todos
+    opcionales); el resto de las claves se conserva.
+    """
+    contacts_cfg = config.get().contact_generation
+    preferred = list(preferred_domains or contacts_cfg.preferred_domains)
+    forbidden = {d.lower() for d in forbidden_domains} if forbidden_domains else contacts_cfg.forbid_generic_domains
+    avatar_provider = avatar_provider or contacts_cfg.avatar_provider
+    rng = rng or random
+    domains = rng.choices(preferred, k=len(raw_contacts))
+    used = set()
+    next_suffix = {}
+    out = []
+    for raw, domain in zip(raw_contacts, domains):
+        rec = dict(raw)
+        first, last = rec.get("first_name"), rec.get("last_name")
+        if not (first and last):
+            parts = (rec.get("name") or "").split(None, 1)
+            if len(parts) == 2:
+                first, last = first or parts[0], last or parts[1]
+            else:
+                ident = identity()
+                first, last = first or ident[0], last or ident[1]
+        rec["first_name"], rec["last_name"] = first, last
+        rec["name"] = rec.get("name") or f"{first} {last}"
+
+        email = rec.get("email")
+        if _needs_rewrite(email, forbidden):
+            ascii_name = unicodedata.normalize("NFKD", f"{first}.{last}").encode("ascii", "ignore").decode()
+            local = _LOCAL_PART_JUNK.sub("", ascii_name.lower().replace(" ", "-")) or "contacto"
+            email = f"{local}@{domain}"
+        email = email.lower()
+        if email in used:
+            # el sufijo sigue desde el último asignado a esta dirección: lineal aunque se repita mucho
+            local, _, host = email.partition("@")
+            n = next_suffix.get(email, 2)
+            while f"{local}{n}@{host}" in used:
+                n += 1
+            next_suffix[email] = n + 1
+            email = f"{local}{n}@{host}"
+        used.add(email)
+        rec["email"] = email
+        rec["avatar"] = avatar_for(rec["name"], avatar_provider, assets=assets)
+        out.append(rec)
+    return out
+
+_MIMETYPES = {"svg": "image/svg+xml", "png": "image/png", "webp": "image/webp", "jpg": "image/jpeg"}
+
+def _local_asset(subdir, fname, data, assets):
+    """Ruta assets/<subdir>/<archivo> registrada en `assets`, o un data: URI si no hay dónde ponerla"""
+    if assets is None:
+        mime = _MIMETYPES.get(fname.rpartition(".")[2], "application/octet-stream")
+        return f"data:{mime};base64,{base64.b64encode(data).decode('ascii')}"
+    rel = f"assets/{subdir}/{fname}"
+    assets[rel] = data
+    return rel
+
+def avatar_for(name, provider="dicebear", assets=None):
+    """
+    URL del avatar. Con provider "local" / "local-initials" se genera sin red
+    (factories.avatars): si se pasa `assets` (dict {ruta relativa: bytes} que
+    la factory escribe con el item) se agrega ahí y se devuelve la ruta
+    relativa al item; si no, se devuelve un data: URI.
+    """
+    if provider in ("local", "local-initials"):
+        from factories.avatars import avatar_file
+        fname, data = avatar_file(name, style="initials" if provider == "local-initials" else "identicon")
+        return _local_asset("avatars", fname, data, assets)
     seed = quote((name or "tektra_user").replace(" ", "_"))
     if provider == "ui-avatars":
         return f"https://ui-avatars.com/api/?name={seed}&size=256&background=random"
@@ -38,3 +195,17 @@ def avatar_for(name, provider="dicebear"):
 def picsum(width=1200, height=800, seed=None):
     s = f"?random={seed}" if seed else ""
     return f"https://picsum.photos/{width}/{height}{s}"
+
+def image_for(width=1200, height=800, seed=None, provider=None, assets=None):
+    """
+    Imagen para un slot del sitio. "local" genera un placeholder sin red
+    (factories.placeholders) y lo agrega a `assets` como assets/img/<archivo>
+    (o data: URI sin `assets`, igual que avatar_for); "picsum" devuelve la
+    URL remota de siempre.
+    """
+    provider = provider or config.get().web_generation.image_provider
+    if provider != "local":
+        return picsum(width, height, seed)
+    from factories.placeholders import placeholder_file
+    fname, data = placeholder_file(width, height, seed)
+    return _local_asset("img", fname, data, assets)
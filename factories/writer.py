@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+Escritura de salidas compartida por las factories.
+
+Una factory arma su item como pares (ruta relativa a output/, contenido) y
+llama a write_item() una sola vez:
+
+- los archivos bajo un mismo directorio de item (<día>/web_x/...) se
+  escriben en un directorio temporal oculto y aparecen con un único rename
+- los archivos sueltos del día (<día>/img_x.txt) van por archivo temporal +
+  os.replace, en el orden dado (el archivo principal conviene último)
+
+El almacenamiento es intercambiable: DiskBackend (default) escribe bajo
+output/, MemoryBackend guarda todo en un dict (orchestrator --dry-run).
+Los recursos compartidos entre items (_atlas/...) también pasan por el
+writer, y se consultan con read() antes de regenerarlos.
+
+Política de fsync (output.fsync en config.yaml, solo DiskBackend):
+    none   no se fuerza nada (default; el SO vuelca cuando quiere)
+    item   fsync de cada archivo y del directorio antes de volver
+    batch  se acumulan y se sincronizan todos juntos en flush()
+"""
+
+from pathlib import Path
+import itertools
+import logging
+import os
+import shutil
+import threading
+
+import config
+from factories.utils import output_root
+
+log = logging.getLogger("tektra.writer")
+
+FSYNC_POLICIES = config.FSYNC_POLICIES
+
+def _fsync_path(p: Path) -> None:
+    fd = os.open(p, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+class DiskBackend:
+    """Escribe bajo una raíz real, con archivos temporales + rename"""
+
+    def __init__(self, root: Path, fsync: str = "none"):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync debe ser uno de {FSYNC_POLICIES}, no {fsync!r}")
+        self.root, self.fsync = Path(root), fsync
+        self._pending = []        # rutas a sincronizar en sync_pending() (política batch)
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def _tmp_name(self, final: Path, suffix: str) -> Path:
+        return final.with_name(f".{final.name}.{os.getpid()}-{next(self._seq)}.{suffix}")
+
+    def _write(self, path: Path, payload: bytes) -> None:
+        with open(path, "wb") as f:
+            f.write(payload)
+            if self.fsync == "item":
+                f.flush()
+                os.fsync(f.fileno())
+
+    def read(self, rel: Path) -> bytes | None:
+        try:
+            return (self.root / rel).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def write_file(self, rel: Path, payload: bytes) -> int:
+        final = self.root / rel
+        final.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self._tmp_name(final, "tmp")
+        self._write(tmp, payload)
+        os.replace(tmp, final)
+        return self._synced([final], {final.parent})
+
+    def write_dir(self, rel: Path, entries: list) -> int:
+        final = self.root / rel
+        final.parent.mkdir(parents=True, exist_ok=True)
+        stage = self._tmp_name(final, "tmp")
+        stage.mkdir()
+        try:
+            for sub, payload in entries:
+                target = stage / sub
+                target.parent.mkdir(parents=True, exist_ok=True)
+                self._write(target, payload)
+            if final.exists():
+                # reemplazo de un item existente: se aparta el viejo y se borra después del rename
+                old = self._tmp_name(final, "old")
+                os.replace(final, old)
+                os.replace(stage, final)
+                shutil.rmtree(old, ignore_errors=True)
+            else:
+                os.replace(stage, final)
+        except BaseException:
+            shutil.rmtree(stage, ignore_errors=True)
+            raise
+        return self._synced([final / sub for sub, _ in entries], {final.parent, final})
+
+    def _synced(self, files: list, dirs: set) -> int:
+        if self.fsync == "item":
+            # los archivos ya se sincronizaron antes del rename; falta la entrada de directorio
+            for d in dirs:
+                _fsync_path(d)
+            return len(files) + len(dirs)
+        if self.fsync == "batch":
+            with self._lock:
+                self._pending.extend(files)
+                self._pending.extend(dirs)
+        return 0
+
+    def sync_pending(self) -> int:
+        with self._lock:
+            pending, self._pending = list(dict.fromkeys(self._pending)), []
+        for p in pending:
+            try:
+                _fsync_path(p)
+            except FileNotFoundError:
+                pass
+        return len(pending)
+
+class MemoryBackend:
+    """
+    Guarda los archivos en un dict {ruta relativa: bytes}, sin tocar el disco.
+    Para --dry-run y pruebas de volumen; clear() libera lo acumulado salvo
+    los recursos compartidos (_atlas/...), que se reusan entre ciclos.
+    """
+
+    fsync = "none"
+
+    def __init__(self):
+        self.files: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def read(self, rel: Path) -> bytes | None:
+        with self._lock:
+            return self.files.get(rel.as_posix())
+
+    def write_file(self, rel: Path, payload: bytes) -> int:
+        with self._lock:
+            self.files[rel.as_posix()] = payload
+        return 0
+
+    def write_dir(self, rel: Path, entries: list) -> int:
+        prefix = rel.as_posix() + "/"
+        with self._lock:
+            # igual que en disco, el item nuevo reemplaza entero al anterior
+            for k in [k for k in self.files if k.startswith(prefix)]:
+                del self.files[k]
+            for sub, payload in entries:
+                self.files[prefix + sub.as_posix()] = payload
+        return 0
+
+    def sync_pending(self) -> int:
+        return 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self.files = {k: v for k, v in self.files.items() if k.startswith("_")}
+
+class OutputWriter:
+    def __init__(self, root: Path = None, fsync: str = None, backend=None):
+        self.root = Path(root) if root else output_root()
+        self.backend = backend or DiskBackend(self.root, fsync or config.get().output.fsync)
+        self.fsync = self.backend.fsync
+        self.stats = {"items": 0, "files": 0, "bytes": 0, "fsyncs": 0}
+        self._written: list[Path] = []   # raíces de items escritas, hasta el próximo take_written()
+        self._lock = threading.Lock()
+
+    def write_item(self, files) -> list:
+        """Escribe los (ruta relativa, bytes | str) de un item; devuelve las rutas de nivel superior creadas"""
+        groups = {}
+        n_files = n_bytes = 0
+        for rel, data in files:
+            payload = data.encode("utf-8") if isinstance(data, str) else bytes(data)
+            n_files += 1
+            n_bytes += len(payload)
+            parts = Path(rel).parts
+            # <día>/<item>/<archivo...> se agrupa por directorio de item; <día>/<archivo> va suelto
+            if len(parts) > 2:
+                groups.setdefault(Path(*parts[:2]), []).append((Path(*parts[2:]), payload))
+            else:
+                groups.setdefault(Path(rel), []).append((None, payload))
+        fsyncs = 0
+        for key, entries in groups.items():
+            if entries[0][0] is None:
+                for _, payload in entries:
+                    fsyncs += self.backend.write_file(key, payload)
+            else:
+                fsyncs += self.backend.write_dir(key, entries)
+        with self._lock:
+            # los recursos compartidos (_atlas/...) suman archivos y bytes, pero no son items
+            self.stats["items"] += not all(k.parts[0].startswith("_") for k in groups)
+            self.stats["files"] += n_files
+            self.stats["bytes"] += n_bytes
+            self.stats["fsyncs"] += fsyncs
+            self._written.extend(k for k in groups if not k.parts[0].startswith("_"))
+        return [self.root / k for k in groups]
+
+    def take_written(self) -> list[Path]:
+        """Raíces (relativas a output/) escritas desde la llamada anterior, incluidos los reemplazos"""
+        with self._lock:
+            written, self._written = self._written, []
+        return written
+
+    def read(self, rel) -> bytes | None:
+        """Contenido actual de `rel` (relativa a output/) en el backend, o None"""
+        return self.backend.read(Path(rel))
+
+    def flush(self) -> int:
+        """Sincroniza lo pendiente (política batch); devuelve cuántos fsync hizo"""
+        n = self.backend.sync_pending()
+        with self._lock:
+            self.stats["fsyncs"] += n
+        return n
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return dict(self.stats)
+
+_default = None
+_default_lock = threading.Lock()
+
+def set_writer(writer: OutputWriter | None) -> None:
+    """Reemplaza el writer del proceso (p. ej. uno con MemoryBackend para --dry-run)"""
+    global _default
+    with _default_lock:
+        if _default is not None:
+            _default.flush()
+        _default = writer
+
+def get_writer() -> OutputWriter:
+    """Writer del proceso, sobre la raíz de output/ vigente"""
+    global _default
+    root = output_root()
+    with _default_lock:
+        if _default is None or (_default.root != root and isinstance(_default.backend, DiskBackend)):
+            if _default is not None:
+                _default.flush()
+            _default = OutputWriter(root)
+        return _default
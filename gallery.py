@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Galería estática de output/ para GitHub Pages, generada desde el catálogo.
+
+Páginas (en Tektra/gallery/):
+    index.html          la página más reciente del listado
+    page/<n>.html       listado paginado; la página 1 es la más vieja, así
+                        un item nuevo solo toca la última
+    days.html           días con su cantidad de items
+    day/<día>.html      items de un día
+    item/<id>.html      detalle de un item; id = hash de la ruta, no cambia
+                        al reconstruir el catálogo ni al archivar el día
+
+Los items de días archivados (output/<día>.zip, packs.py) se listan sin
+links al contenido: GitHub Pages no sirve entradas de un zip.
+
+log/gallery.json guarda el mapa de dependencias: para cada página, los ids
+que muestra y un digest de sus entradas. En cada build se recalculan los
+digests (barato: solo columnas del catálogo) y se renderizan únicamente las
+páginas cuyo digest cambió; las que ya no existen se borran.
+
+Uso:  python gallery.py build [--full] [--out DIR]
+"""
+
+from __future__ import annotations
+from collections import defaultdict
+from html import escape
+from pathlib import Path
+import argparse, hashlib, json, logging, os
+
+import catalog, config, indexes
+
+ROOT = Path(__file__).parent.resolve()
+GALLERY_DIR = ROOT / "Tektra" / "gallery"
+DEPS_PATH = ROOT / "log" / "gallery.json"
+PAGE_SIZE = 60
+# subir al cambiar el HTML/CSS: invalida todas las páginas
+TEMPLATE_VERSION = 2
+
+log = logging.getLogger("tektra.gallery")
+
+_LABELS = {"websites": "Web", "images": "Imagen", "games": "Juego", "notes": "Nota"}
+_IMG_EXTS = (".svg", ".png", ".jpg", ".jpeg", ".webp", ".gif")
+
+CSS = """\
+body{margin:0;font-family:Inter,system-ui,sans-serif;background:#0b0b14;color:#e5e7eb}
+header{padding:1.2rem 2rem;background:linear-gradient(90deg,#f472b6,#3b82f6);color:#fff}
+header a{color:#fff;margin-right:1rem;text-decoration:none;font-weight:600}
+main{padding:1.5rem 2rem}
+.grid{display:grid;grid-template-columns:repeat(auto-fill,minmax(220px,1fr));gap:1rem}
+.card{background:#151526;border-radius:12px;padding:.8rem;overflow:hidden}
+.card img{width:100%;height:140px;object-fit:cover;border-radius:8px;background:#222}
+.card a{color:#93c5fd;text-decoration:none}
+.kind{font-size:.75rem;text-transform:uppercase;color:#f472b6}
+.meta{font-size:.8rem;color:#9ca3af}
+nav.pager{margin:1.5rem 0;display:flex;gap:1rem}
+nav.pager a{color:#93c5fd}
+iframe{width:100%;height:70vh;border:0;border-radius:12px;background:#fff}
+"""
+
+def _digest(*parts) -> str:
+    return hashlib.sha1(json.dumps([TEMPLATE_VERSION, *parts], sort_keys=True).encode()).hexdigest()[:16]
+
+# --- entradas ---
+def stable_id(path: str) -> str:
+    return hashlib.sha1(path.encode("utf-8")).hexdigest()[:12]
+
+def _day(item: dict) -> str:
+    return item["path"].split("/")[1]
+
+def _items(cat: catalog.Catalog, output_root: Path) -> list[dict]:
+    """Items del catálogo con id estable, ordenados por (día, ruta): igual en cualquier checkout"""
+    items, live = [], {}
+    for i in range(len(cat)):
+        it = cat.record(i)
+        it["id"] = stable_id(it["path"])
+        day = _day(it)
+        if day not in live:
+            live[day] = (output_root / day).is_dir()
+        it["archived"] = not live[day]
+        items.append(it)
+    items.sort(key=lambda it: (_day(it), it["path"]))
+    return items
+
+class _Titles:
+    """Títulos desde el manifest de cada día (se leen solo los días que se renderizan)"""
+
+    def __init__(self, output_root: Path):
+        self.output_root = output_root
+        self._by_day: dict[str, dict] = {}
+
+    def __call__(self, item: dict) -> str:
+        day = _day(item)
+        if day not in self._by_day:
+            self._by_day[day] = {r["path"]: r.get("title") for r in indexes.read_manifest(self.output_root / day)}
+        return self._by_day[day].get(item["path"]) or Path(item["path"]).name
+
+def _by_day(items: list[dict]) -> dict[str, list[str]]:
+    per_day = defaultdict(list)
+    for it in items:
+        per_day[_day(it)].append(it["id"])
+    return per_day
+
+def plan(items: list[dict]) -> dict[str, dict]:
+    """Páginas a generar: {ruta relativa: {"items": [ids], "digest", "render": (tipo, args)}}"""
+    pages = {}
+    by_id = {it["id"]: it for it in items}
+    key = lambda it: (it["id"], it["ts"], it["size"], it["path"], it["archived"])
+
+    n_pages = max(1, -(-len(items) // PAGE_SIZE))
+    for k in range(n_pages):
+        chunk = items[k * PAGE_SIZE:(k + 1) * PAGE_SIZE]
+        has_next = k + 1 < n_pages
+        ids = [it["id"] for it in chunk]
+        pages[f"page/{k + 1}.html"] = {"items": ids, "digest": _digest("page", k, has_next, [key(it) for it in chunk]),
+                                       "render": ("page", (k + 1, has_next))}
+    last = pages[f"page/{n_pages}.html"]
+    pages["index.html"] = {"items": last["items"], "digest": _digest("index", n_pages, last["digest"]),
+                           "render": ("page", (n_pages, False))}
+
+    per_day = _by_day(items)
+    for day, ids in per_day.items():
+        pages[f"day/{day}.html"] = {"items": ids, "digest": _digest("day", day, [key(by_id[i]) for i in ids]),
+                                    "render": ("day", (day,))}
+    counts = sorted((d, len(ids)) for d, ids in per_day.items())
+    pages["days.html"] = {"items": [], "digest": _digest("days", counts), "render": ("days", ())}
+
+    for it in items:
+        pages[f"item/{it['id']}.html"] = {"items": [it["id"]], "digest": _digest("item", key(it), it["kind"]),
+                                          "render": ("item", ())}
+    pages["gallery.css"] = {"items": [], "digest": _digest("css", CSS), "render": ("css", ())}
+    return pages
+
+# --- render ---
+class _Renderer:
+    def __init__(self, out_dir: Path, output_root: Path, by_id: dict[str, dict], per_day: dict[str, list[str]]):
+        self.out_dir, self.output_root = out_dir, output_root
+        self.by_id, self.per_day = by_id, per_day
+        self.title = _Titles(output_root)
+
+    def _href(self, page: str, target: Path) -> str:
+        return Path(os.path.relpath(target, (self.out_dir / page).parent)).as_posix()
+
+    def _layout(self, page: str, title: str, body: str) -> str:
+        g = lambda p: self._href(page, self.out_dir / p)
+        return (f'<!DOCTYPE html>\n<html lang="es"><head><meta charset="UTF-8">'
+                f'<meta name="viewport" content="width=device-width, initial-scale=1.0">'
+                f'<title>{escape(title)} · Tektra</title><link rel="stylesheet" href="{g("gallery.css")}"></head>\n'
+                f'<body><header><a href="{g("index.html")}">Tektra · Galería</a><a href="{g("days.html")}">Días</a>'
+                f'<a href="{self._href(page, self.out_dir.parent / "index.html")}">Inicio</a></header>\n'
+                f'<main><h1>{escape(title)}</h1>\n{body}</main></body></html>\n')
+
+    def _card(self, page: str, it: dict) -> str:
+        src = self._href(page, self.output_root.parent / it["path"])
+        thumb = (f'<img loading="lazy" src="{src}" alt="">'
+                 if it["path"].lower().endswith(_IMG_EXTS) and not it["archived"] else "")
+        detail = self._href(page, self.out_dir / "item" / f"{it['id']}.html")
+        return (f'<div class="card">{thumb}<div class="kind">{_LABELS.get(it["kind"], it["kind"])}</div>'
+                f'<a href="{detail}">{escape(self.title(it))}</a>'
+                f'<div class="meta">{it["ts"][:16].replace("T", " ")}</div></div>')
+
+    def _grid(self, page: str, ids: list[str]) -> str:
+        return '<div class="grid">\n' + "\n".join(self._card(page, self.by_id[i]) for i in ids) + "\n</div>\n"
+
+    def page(self, page: str, spec: dict, n: int, has_next: bool) -> str:
+        pager = []
+        link = lambda k: self._href(page, self.out_dir / "page" / f"{k}.html")
+        if n > 1:
+            pager.append(f'<a href="{link(n - 1)}">← anteriores</a>')
+        if has_next:
+            pager.append(f'<a href="{link(n + 1)}">más nuevos →</a>')
+        body = self._grid(page, spec["items"][::-1]) + f'<nav class="pager">{"".join(pager)}</nav>\n'
+        return self._layout(page, "Últimas creaciones" if page == "index.html" else f"Página {n}", body)
+
+    def day(self, page: str, spec: dict, day: str) -> str:
+        return self._layout(page, day, self._grid(page, spec["items"]))
+
+    def days(self, page: str, spec: dict) -> str:
+        rows = "".join(f'<li><a href="day/{d}.html">{d}</a> <span class="meta">({len(ids)})</span></li>\n'
+                       for d, ids in sorted(self.per_day.items(), reverse=True))
+        return self._layout(page, "Días", f"<ul>\n{rows}</ul>\n")
+
+    def item(self, page: str, spec: dict) -> str:
+        it = self.by_id[spec["items"][0]]
+        target = self.output_root.parent / it["path"]
+        src = self._href(page, target)
+        day = _day(it)
+        day_href = self._href(page, self.out_dir / "day" / f"{day}.html")
+        if it["archived"]:
+            view = ""
+            link = f'<p class="meta">{escape(it["path"])} · día archivado en {day}.zip</p>'
+        else:
+            if it["path"].lower().endswith(_IMG_EXTS):
+                view = f'<img src="{src}" alt="" style="max-width:100%">'
+            elif it["kind"] in ("websites", "games"):
+                view = f'<iframe src="{src}/index.html" loading="lazy"></iframe>'
+            else:
+                view = ""
+            link = f'<p><a href="{src}">Abrir {escape(it["path"])}</a></p>'
+        body = (f'<p class="meta">{_LABELS.get(it["kind"], it["kind"])} · {it["ts"][:19].replace("T", " ")} · '
+                f'{it["size"]:,} bytes · <a href="{day_href}">{day}</a></p>\n{link}\n{view}\n')
+        return self._layout(page, self.title(it), body)
+
+    def css(self, page: str, spec: dict) -> str:
+        return CSS
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+def _load_deps(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8")).get("pages", {})
+    except (OSError, ValueError):
+        return {}
+
+def build(cat: catalog.Catalog, out_dir: Path = GALLERY_DIR, output_root: Path | None = None,
+          deps_path: Path = DEPS_PATH, full: bool = False) -> tuple[int, int]:
+    """Renderiza las páginas cuyo digest cambió; devuelve (renderizadas, borradas)"""
+    output_root = output_root or config.output_root()
+    items = _items(cat, output_root)
+    pages = plan(items)
+    old = {} if full else _load_deps(deps_path)
+    r = _Renderer(out_dir, output_root, {it["id"]: it for it in items}, _by_day(items))
+
+    rendered = 0
+    for page, spec in pages.items():
+        if old.get(page, {}).get("digest") == spec["digest"] and (out_dir / page).exists():
+            continue
+        kind, args = spec["render"]
+        _write(out_dir / page, getattr(r, kind)(page, spec, *args))
+        rendered += 1
+    removed = 0
+    for page in old.keys() - pages.keys():
+        try:
+            (out_dir / page).unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+    deps = {p: {"items": s["items"], "digest": s["digest"]} for p, s in pages.items()}
+    deps_path.parent.mkdir(parents=True, exist_ok=True)
+    _write(deps_path, json.dumps({"template": TEMPLATE_VERSION, "pages": deps}, separators=(",", ":")))
+    return rendered, removed
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Galería estática de output/ (GitHub Pages)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="actualizar el catálogo y renderizar las páginas que cambiaron")
+    b.add_argument("--full", action="store_true", help="renderizar todas las páginas")
+    b.add_argument("--out", type=Path, default=GALLERY_DIR)
+    b.add_argument("--output", type=Path, help="default: output.base_dir de config.yaml")
+    args = ap.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    output_root = (args.output or config.output_root()).resolve()
+    cat = catalog.Catalog()
+    catalog.update(cat, output_root)
+    rendered, removed = build(cat, args.out.resolve(), output_root, full=args.full)
+    log.info("Galería: %d páginas renderizadas, %d borradas (%d items)", rendered, removed, len(cat))
+
+if __name__ == "__main__":
+    main()
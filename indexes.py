@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Índices de salidas derivados de los manifests por día.
+
+Cada ciclo agrega sus items a output/<día>/manifest.jsonl (append-only). A
+partir de ahí:
+- output/changelog.jsonl recibe las mismas líneas (append)
+- INDEX.md y output/index.md van en orden cronológico, así que actualizar un
+  día es reemplazar la última sección del archivo (truncate + write). Solo un
+  día anterior al último, o un archivo en formato viejo, fuerza una
+  reconstrucción completa.
+- los días archivados por packs.py se leen desde su pack (manifest.jsonl
+  dentro del zip o, si no lo tenía, los registros guardados al archivar)
+
+Uso:  python indexes.py rebuild   # migra/regenera todo desde los manifests
+"""
+
+from __future__ import annotations
+from pathlib import Path
+import argparse, json, logging, os
+
+import config, packs, scanner
+
+ROOT = Path(__file__).parent.resolve()
+MANIFEST = "manifest.jsonl"
+MARKER = "<!-- tektra:index v2 (cronológico, generado desde manifest.jsonl) -->"
+
+log = logging.getLogger("tektra.indexes")
+
+_LABELS = {"websites": "WEB", "images": "IMAGE", "games": "GAME", "notes": "NOTE"}
+
+def _manifest_record(rec: dict) -> dict:
+    return {"ts": rec["ts"], "kind": rec["kind"], "title": rec["title"], "path": rec["path"]}
+
+def append_manifest(day_dir: Path, records: list[dict]) -> list[dict]:
+    """Agrega los items al manifest del día; devuelve las líneas escritas"""
+    lines = [_manifest_record(r) for r in records]
+    if lines:
+        with open(day_dir / MANIFEST, "a", encoding="utf-8") as f:
+            for r in lines:
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    return lines
+
+def read_manifest(day_dir: Path) -> list[dict]:
+    """Manifest del día, desde output/<día>/ o desde output/<día>.zip si ya se archivó"""
+    p = day_dir / MANIFEST
+    if p.exists():
+        with open(p, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    else:
+        pack = packs.open_pack(day_dir.parent, day_dir.name)
+        if pack is None:
+            return []
+        if MANIFEST not in pack:
+            return [_manifest_record(r) for r in sorted(pack.records(), key=lambda r: r["ts"])]
+        lines = bytes(pack.read(MANIFEST)).decode("utf-8").splitlines()
+    out = []
+    for line in lines:
+        line = line.strip()
+        if line:
+            try:
+                out.append(json.loads(line))
+            except ValueError:
+                log.warning("Línea inválida en %s", p)
+    return out
+
+# --- formatos de cada índice ---
+class _MarkdownIndex:
+    def __init__(self, path: Path, title: str, line_fmt):
+        self.path, self.title, self.line_fmt = path, title, line_fmt
+
+    def header(self) -> str:
+        return f"{self.title}\n{MARKER}\n"
+
+    def section(self, day: str, records: list[dict]) -> str:
+        body = "".join(self.line_fmt(r) + "\n" for r in sorted(records, key=lambda r: r["ts"]))
+        return f"\n## {day}\n{body}"
+
+def _root_line(r: dict) -> str:
+    return f"- {_LABELS.get(r['kind'], r['kind'].upper()):<6} — {r['title']}  → {r['path']}"
+
+def _output_line(r: dict) -> str:
+    return f"- {Path(r['path']).name} → `{r['path']}`"
+
+def _indexes(output_root: Path) -> list[_MarkdownIndex]:
+    return [
+        _MarkdownIndex(output_root.parent / "INDEX.md", "# Maker-Bot — Índice de salidas", _root_line),
+        _MarkdownIndex(output_root / "index.md", "# Maker Bot — Outputs", _output_line),
+    ]
+
+def _last_section(path: Path) -> tuple[int, str] | None:
+    """(offset, día) de la última sección '## <día>', leyendo solo el final del archivo"""
+    size = path.stat().st_size
+    chunk = 8192
+    with open(path, "rb") as f:
+        while True:
+            start = max(0, size - chunk)
+            f.seek(start)
+            data = f.read(size - start)
+            i = data.rfind(b"\n## ")
+            if i >= 0:
+                end = data.find(b"\n", i + 1)
+                day = data[i + 4:end if end >= 0 else None].decode("utf-8").strip()
+                return start + i, day
+            if start == 0:
+                return None
+            chunk *= 4
+
+def _is_current_format(path: Path) -> bool:
+    if not path.exists():
+        return False
+    with open(path, encoding="utf-8") as f:
+        f.readline()
+        return f.readline().rstrip("\n") == MARKER
+
+
+def rebuild(output_root: Path | None = None, bootstrap: bool = True) -> None:
+    """
+    Regenera los tres índices desde los manifests. Con bootstrap, los días
+    sin manifest (anteriores a este formato) lo obtienen de scanner.py.
+    """
+    output_root = output_root or config.output_root()
+    per_day, missing = [], []
+    for day, mtime in scanner.day_sources(output_root):
+        name = scanner.day_name(day)
+        recs = read_manifest(output_root / name)
+        if recs:
+            per_day.append((name, recs))
+        elif bootstrap and day.is_dir():
+            missing.append((day, mtime))
+    if missing:
+        for day, _, found in scanner.scan_by_day(output_root, days=missing):
+            if found:
+                per_day.append((day, append_manifest(output_root / day, sorted(found, key=lambda r: r["ts"]))))
+        per_day.sort(key=lambda d: d[0])
+    for idx in _indexes(output_root):
+        tmp = idx.path.with_suffix(".tmp")
+        tmp.write_text(idx.header() + "".join(idx.section(d, r) for d, r in per_day), encoding="utf-8")
+        os.replace(tmp, idx.path)
+    tmp = output_root / "changelog.jsonl.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for _, recs in per_day:
+            for r in recs:
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    os.replace(tmp, output_root / "changelog.jsonl")
+
+def record_cycle(day_dir: Path, records: list[dict], output_root: Path | None = None) -> None:
+    """Registra los items de un ciclo y actualiza solo la sección de ese día"""
+    output_root = output_root or config.output_root()
+    lines = append_manifest(day_dir, records)
+    if not lines:
+        return
+    indexes = _indexes(output_root)
+    changelog = output_root / "changelog.jsonl"
+    if not changelog.exists() or not all(_is_current_format(i.path) for i in indexes):
+        log.info("Índices en formato anterior: reconstrucción completa")
+        rebuild(output_root)
+        return
+
+    with open(changelog, "a", encoding="utf-8") as f:
+        for r in lines:
+            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+
+    day = day_dir.name
+    day_records = read_manifest(day_dir)
+    for idx in indexes:
+        last = _last_section(idx.path)
+        if last is None or last[1] < day:
+            with open(idx.path, "a", encoding="utf-8") as f:
+                f.write(idx.section(day, day_records))
+        elif last[1] == day:
+            with open(idx.path, "r+b") as f:
+                f.truncate(last[0])
+                f.seek(last[0])
+                f.write(idx.section(day, day_records).encode("utf-8"))
+        else:
+            # un día viejo (p. ej. backfill): es el único caso que reescribe todo
+            rebuild(output_root, bootstrap=False)
+            return
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Índices de output/ desde los manifests por día")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    rb = sub.add_parser("rebuild", help="regenerar INDEX.md, output/index.md y output/changelog.jsonl")
+    rb.add_argument("--output", type=Path, help="default: output.base_dir de config.yaml")
+    rb.add_argument("--no-bootstrap", action="store_true", help="no crear manifests para días viejos")
+    args = ap.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    rebuild((args.output or config.output_root()).resolve(), bootstrap=not args.no_bootstrap)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Carga de items de output/ en log/status.db.
+
+- describe(): convierte una entrada de output/<día>/ en un registro de items
+  (la clasificación vive en scanner.py)
+- backfill(): recorre output/ con scanner.scan_by_day de forma incremental usando como marca de agua
+  el mtime de los días ya procesados (directorios o packs de packs.py); con --full además corrige
+  el ts de las filas que quedaron fechadas en otro día (backfills viejos tomaban el mtime)
+
+Uso:  python ingest.py backfill [--full] [--db RUTA] [--output DIR]
+"""
+
+from __future__ import annotations
+from pathlib import Path
+import argparse, logging, sqlite3
+
+import config, scanner, statusdb
+
+ROOT = Path(__file__).parent.resolve()
+HWM_KEY = "backfill_day_mtime"
+
+log = logging.getLogger("tektra.ingest")
+
+DAY_RE = scanner.DAY_RE
+
+def describe(p: Path, output_root: Path | None = None) -> dict | None:
+    """Registro para BatchWriter.add() a partir de una entrada de output/<día>/, o None"""
+    output_root = output_root or config.output_root()
+    return scanner.classify(p, output_root)
+
+def backfill(con: sqlite3.Connection, output_root: Path | None = None, full: bool = False) -> int:
+    """
+    Inserta las entradas de output/ que todavía no están en items.
+    Solo se listan los días cuyo mtime alcanza la marca de agua guardada
+    (agregar una entrada a un día actualiza el mtime de su directorio).
+    Con full, las filas ya cargadas toman el ts de scanner si el día no coincide.
+    """
+    output_root = output_root or config.output_root()
+    hwm = 0.0 if full else float(statusdb.get_state(con, HWM_KEY, "0"))
+    new_hwm = hwm
+    total = fixed = 0
+    writer = statusdb.BatchWriter(con)
+    for day, mtime, records in scanner.scan_by_day(output_root, min_mtime=hwm):
+        prefix = f"{output_root.name}/{day}/"
+        known = {r[0] for r in con.execute(
+            "SELECT path FROM items WHERE path >= ? AND path < ?", (prefix, prefix[:-1] + "0"))}
+        for rec in records:
+            if rec["path"] not in known:
+                writer.add(**rec)
+        if full:
+            with con:
+                fixed += con.executemany(
+                    "UPDATE items SET ts = ? WHERE path = ? AND substr(ts, 1, 10) != substr(?, 1, 10)",
+                    [(r["ts"], r["path"], r["ts"]) for r in records if r["path"] in known]).rowcount
+        new_hwm = max(new_hwm, mtime)
+        # una transacción por día: un corte a mitad de camino no pierde lo ya cargado
+        total += writer.flush(state={HWM_KEY: new_hwm})
+    if fixed:
+        log.info("Backfill: ts corregido en %d items", fixed)
+    return total
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Carga output/ en log/status.db")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    bf = sub.add_parser("backfill", help="carga incremental de output/")
+    bf.add_argument("--full", action="store_true", help="ignorar la marca de agua y revisar todos los días")
+    bf.add_argument("--db", default=statusdb.DEFAULT_DB)
+    bf.add_argument("--output", type=Path, help="default: output.base_dir de config.yaml")
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    con = statusdb.connect(args.db)
+    statusdb.ensure_schema(con)
+    n = backfill(con, (args.output or config.output_root()).resolve(), full=args.full)
+    con.close()
+    log.info("Backfill: %d items nuevos", n)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Logging del orquestador y las factories.
+
+setup() deja en el root logger un único QueueHandler: el hilo que loguea
+solo encola el LogRecord (sin formatear) y un QueueListener en segundo
+plano lo formatea y lo escribe en la consola y, opcionalmente, en un
+archivo JSON lines. Con argumentos estilo % (log.info("x %s", v)) el
+mensaje tampoco se arma si el nivel está apagado.
+
+Cada registro lleva `cid`, el correlation id vigente (contextvar), que se
+fija por item con `with correlation("run:website"):`.
+"""
+
+from __future__ import annotations
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+import atexit, copy, datetime as dt, json, logging, queue, uuid
+
+CONSOLE_FORMAT = "%(asctime)s %(levelname)s %(message)s"
+
+_cid: ContextVar[str] = ContextVar("tektra_cid", default="-")
+_listener: QueueListener | None = None
+_handlers: list[logging.Handler] = []
+
+def new_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+@contextmanager
+def correlation(cid: str | None = None):
+    """Fija el correlation id de todo lo que se loguee dentro del bloque"""
+    token = _cid.set(cid or new_id())
+    try:
+        yield _cid.get()
+    finally:
+        _cid.reset(token)
+
+def current_id() -> str:
+    return _cid.get()
+
+class _ContextQueueHandler(QueueHandler):
+    def prepare(self, record):
+        # como el default, el mensaje se resuelve en el hilo que loguea (un
+        # argumento mutable se ve como estaba en la llamada); a diferencia del
+        # default, formato de línea, exc_info y cid quedan para el listener
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        record.cid = _cid.get()
+        return record
+
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record):
+        out = {
+            "ts": dt.datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname, "logger": record.name,
+            "cid": getattr(record, "cid", "-"), "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            out["exc"] = self.formatException(record.exc_info)
+        return json.dumps(out, ensure_ascii=False, default=str)
+
+def setup(level: int = logging.INFO, json_path=None) -> None:
+    """(Re)configura el root logger con cola + listener; idempotente"""
+    global _listener, _handlers
+    shutdown()
+    root = logging.getLogger()
+    for h in list(root.handlers):
+        root.removeHandler(h)
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+    handlers = [console]
+    if json_path:
+        sink = logging.FileHandler(json_path, encoding="utf-8")
+        sink.setFormatter(JsonLinesFormatter())
+        handlers.append(sink)
+    q = queue.SimpleQueue()
+    root.addHandler(_ContextQueueHandler(q))
+    root.setLevel(level)
+    _handlers = handlers
+    _listener = QueueListener(q, *handlers, respect_handler_level=True)
+    _listener.start()
+
+def shutdown() -> None:
+    """Vacía la cola y detiene el listener (se llama también al salir)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    for h in _handlers:
+        h.close()
+
+atexit.register(shutdown)
@@ -3,19 +3,28 @@
 
 from __future__ import annotations
 from pathlib import Path
-import sys, importlib, importlib.util, logging, json, datetime as dt, traceback
+import sys, argparse, random, importlib, importlib.util, logging, json, time, datetime as dt, traceback
 
 ROOT = Path(__file__).parent.resolve()
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+import logsetup
+logsetup.setup()
 log = logging.getLogger("tektra")
+throughput_log = logging.getLogger("tektra.throughput")
+throughput_log.setLevel(logging.INFO)
 
-def today_folder() -> Path:
+import statusdb, scanner, indexes, profiling
+from factories.utils import output_root
+from factories import diskcache
+from factories.writer import get_writer, set_writer, OutputWriter, MemoryBackend
+
+def today_folder(create: bool = True) -> Path:
     d = dt.datetime.now().strftime("%Y-%m-%d")
-    out = ROOT / "output" / d
-    out.mkdir(parents=True, exist_ok=True)
+    out = output_root() / d
+    if create:
+        out.mkdir(parents=True, exist_ok=True)
     return out
 
 def write_run_log(result: dict) -> None:
@@ -84,18 +93,103 @@ def load_factory(func_name: str, canonical_module: str, patterns: list[str]):
     raise RuntimeError(msg)
 
 # cargar factories reales (SIN fallback)
-generate_site  = load_factory("generate_site",  "factories.web_factory",   ["**/factories/web_factory.py",   "**/*web*factory.py"])
-generate_image = load_factory("generate_image", "factories.image_factory", ["**/factories/image_factory.py", "**/*image*factory.py", "**/*img*factory.py"])
-generate_game  = load_factory("generate_game",  "factories.game_factory",  ["**/factories/game_factory.py",  "**/*game*factory.py"])
+generate_site  = load_factory("generate_site",  "factories.factory_websites", ["**/factories/web_factory.py",   "**/*web*factory.py"])
+generate_image = load_factory("generate_image", "factories.factory_images",   ["**/factories/image_factory.py", "**/*image*factory.py", "**/*img*factory.py"])
+generate_game  = load_factory("generate_game",  "factories.factory_games",    ["**/factories/game_factory.py",  "**/*game*factory.py"])
+
+def _open_writer():
+    try:
+        con = statusdb.connect()
+        statusdb.ensure_schema(con)
+        return statusdb.BatchWriter(con)
+    except Exception as e:
+        log.warning("No se pudo abrir status.db: %s", e)
+        return None
 
-def main() -> None:
-    summary = {"started_at": dt.datetime.utcnow().isoformat()+"Z", "items": [], "errors": []}
+def _new_records(root: Path, written: list[Path]) -> list[dict]:
+    # lo que la factory escribió con el writer se registra como items, aunque reemplace un
+    # item del mismo nombre (un segundo web_<nombre> en el día no es una entrada nueva del directorio)
+    recs = []
+    for rel in dict.fromkeys(written):
+        rec = scanner.classify(root / rel, root)
+        if rec:
+            recs.append(rec)
+    return recs
+
+def check_invariants(files: dict) -> list[str]:
+    """Problemas en lo que dejó un ciclo en memoria ({ruta relativa: bytes}); vacío si todo está bien"""
+    problems = []
+    items: dict[str, set] = {}
+    for key, payload in files.items():
+        if not payload:
+            problems.append(f"{key}: archivo vacío")
+        if key.endswith(".json"):
+            try:
+                json.loads(payload)
+            except ValueError as e:
+                problems.append(f"{key}: JSON inválido ({e})")
+        parts = key.split("/")
+        if len(parts) > 2:
+            items.setdefault("/".join(parts[:2]), set()).add("/".join(parts[2:]))
+        elif parts[-1].startswith("img_") and parts[-1].endswith(".txt"):
+            meta = key[:-len(".txt")] + "_metadata.json"
+            if meta not in files:
+                problems.append(f"{key}: falta {meta.rsplit('/', 1)[-1]}")
+    for item, names in items.items():
+        if item.split("/")[-1].startswith(("web_", "game_")):
+            for required in ("index.html", "metadata.json"):
+                if required not in names:
+                    problems.append(f"{item}: falta {required}")
+    return problems
+
+def parse_args(argv=None) -> argparse.Namespace:
+    ap = argparse.ArgumentParser(description="Un ciclo de Tektra: web, imagen y juego")
+    ap.add_argument("--profile", action="store_true", help="perfilar cada factory con cProfile")
+    ap.add_argument("--profile-sample", type=float, default=1.0, metavar="P",
+                    help="con --profile, perfilar solo una fracción P de los ciclos (0-1)")
+    ap.add_argument("--log-json", metavar="RUTA", help="además, log estructurado (JSON lines) en este archivo")
+    ap.add_argument("--profile-top", type=int, default=15, metavar="N", help="funciones a listar en run_log.json")
+    ap.add_argument("--count", type=int, default=1, metavar="N", help="cantidad de ciclos a correr (default 1)")
+    ap.add_argument("--dry-run", action="store_true",
+                    help="generar en memoria sin tocar output/, status.db ni los índices; "
+                         "verifica invariantes y reporta el throughput")
+    args, unknown = ap.parse_known_args(argv)
+    if unknown:
+        log.warning("Argumentos ignorados: %s", " ".join(unknown))
+    return args
+
+def run_cycle(args: argparse.Namespace) -> dict:
+    """Un ciclo: las tres factories y, salvo en --dry-run, run_log, índices y status.db"""
+    dry = args.dry_run
+    run_id = logsetup.new_id()
+    summary = {"run_id": run_id, "started_at": dt.datetime.utcnow().isoformat()+"Z", "items": [], "errors": []}
+    day = today_folder(create=not dry)
+    io_start = get_writer().snapshot()
+    writer = None if dry else _open_writer()
+    produced: list[dict] = []
+    profiler = None
+    if args.profile and random.random() < args.profile_sample:
+        stamp = dt.datetime.now().strftime("%Y%m%d-%H%M%S")
+        profiler = profiling.FactoryProfiler(profiling.PROFILE_DIR / stamp, top_n=args.profile_top)
+        log.info("Perfilando este ciclo en %s", profiler.out_dir)
 
     def _safe(name, fn):
-        item = {"type": name, "status": "ok"}
+        with logsetup.correlation(f"{run_id}:{name}") as cid:
+            _run_factory(name, fn, cid)
+
+    def _run_factory(name, fn, cid):
+        item = {"type": name, "status": "ok", "cid": cid}
+        out = get_writer()
+        out.take_written()   # descarta lo que haya escrito otro código antes de esta factory
+        io_before = out.snapshot()
         try:
-            result = fn()
+            result = profiler.run(name, fn) if profiler else fn()
+            written = out.take_written()
+            if not dry:
+                produced.extend(_new_records(out.root, written))
             item["result"] = result if result is not None else "ok"
+            io_after = out.snapshot()
+            item["io"] = {k: io_after[k] - io_before[k] for k in io_after}
             log.info("Factory %s completada.", name)
         except Exception as e:
             item["status"] = "error"
@@ -103,19 +197,83 @@ def main() -> None:
             summary["errors"].append({"factory": name, "error": str(e), "traceback": traceback.format_exc()})
             log.error("Factory %s falló: %s", name, e)
         finally:
+            if profiler and name in profiler.summaries:
+                item["profile"] = profiler.summaries[name]
             summary["items"].append(item)
 
     _safe("website", generate_site)
     _safe("image",   generate_image)
     _safe("game",    generate_game)
 
+    try:
+        get_writer().flush()
+    except OSError as e:
+        log.warning("No se pudo sincronizar output/: %s", e)
     summary["finished_at"] = dt.datetime.utcnow().isoformat()+"Z"
+    if dry:
+        return summary
+    io_end = get_writer().snapshot()
+    summary["io"] = {k: io_end[k] - io_start[k] for k in io_end}
     write_run_log(summary)
 
-    if all(i["status"] == "error" for i in summary["items"]):
-        log.error("Todas las factories fallaron.")
-        sys.exit(2)
+    try:
+        indexes.record_cycle(day, produced, output_root=day.parent)
+    except Exception as e:
+        log.warning("No se pudieron actualizar los índices: %s", e)
+
+    if writer is not None:
+        # una sola transacción por ciclo; al cerrar la última conexión el WAL se vuelca al .db
+        try:
+            for rec in produced:
+                writer.add(**rec)
+            n = writer.flush()
+            log.info("status.db: %d items registrados.", n)
+        except Exception as e:
+            log.warning("No se pudieron registrar los items en status.db: %s", e)
+        finally:
+            writer.con.close()
     log.info("Ciclo Tektra completado.")
+    return summary
+
+def main(argv=None) -> None:
+    args = parse_args(argv)
+    if args.log_json:
+        logsetup.setup(json_path=args.log_json)
+    backend = None
+    if args.dry_run:
+        backend = MemoryBackend()
+        set_writer(OutputWriter(backend=backend))
+        diskcache.use_memory()   # avatares y placeholders tampoco van a output/
+        if args.count > 1:
+            # con muchos ciclos solo se loguean advertencias y el resumen final
+            log.setLevel(logging.WARNING)
+    started, io_before = time.perf_counter(), get_writer().snapshot()
+    violations: list[str] = []
+    cycles = 0
+    for _ in range(max(args.count, 1)):
+        summary = run_cycle(args)
+        cycles += 1
+        if backend is not None:
+            # se verifica y se libera por ciclo para que la memoria no crezca con --count
+            violations += [f"ciclo {cycles}: {p}" for p in check_invariants(backend.files)]
+            backend.clear()
+        if all(i["status"] == "error" for i in summary["items"]):
+            log.error("Todas las factories fallaron.")
+            sys.exit(2)
+
+    if args.dry_run or args.count > 1:
+        elapsed = time.perf_counter() - started
+        io_after = get_writer().snapshot()
+        io = {k: io_after[k] - io_before[k] for k in io_after}
+        throughput_log.info("%s%d ciclos en %.2f s: %d items (%.1f/s), %d archivos, %.1f MB (%.1f MB/s)",
+                            "[dry-run] " if args.dry_run else "", cycles, elapsed, io["items"],
+                            io["items"] / elapsed if elapsed else 0.0, io["files"], io["bytes"] / 1e6,
+                            io["bytes"] / 1e6 / elapsed if elapsed else 0.0)
+    if violations:
+        for v in violations[:20]:
+            log.error("Invariante: %s", v)
+        log.error("%d invariantes violadas (se muestran las primeras 20).", len(violations))
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
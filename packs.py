@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Archivado de días viejos de output/ en un pack por día.
+
+Cada output/<día>/ se guarda como output/<día>.zip (entradas sin comprimir,
+ZIP_STORED) más output/<día>.idx, un índice binario con el offset de los
+datos de cada entrada. Para leer un archivo se mapea el zip con mmap y se
+devuelve el slice [offset:offset+size], sin extraer ni parsear el zip.
+
+El zip incluye además RECORDS: los registros de scanner.py del día tal como
+estaban al archivarlo, así índices, catálogo e ingest siguen viendo el día
+sin extraerlo.
+
+Formato de .idx (little endian):
+    b"TKPI" | versión u16 | cantidad u32
+    cantidad × (offset u64, size u32, crc32 u32, name_off u32, name_len u16)
+    nombres en UTF-8 concatenados
+
+Uso:  python packs.py archive --older-than 30 [--keep]
+      python packs.py ls 2025-09-12
+      python packs.py cat 2025-09-12/site_x/index.html
+"""
+
+from __future__ import annotations
+from pathlib import Path
+import argparse, datetime as dt, io, json, logging, mmap, os, shutil, struct, sys, threading, zipfile, zlib
+
+import config, scanner
+
+ROOT = Path(__file__).parent.resolve()
+
+log = logging.getLogger("tektra.packs")
+
+_MAGIC = b"TKPI"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHI")
+_ENTRY = struct.Struct("<QIIIH")
+_LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")   # cabecera local de zip (30 bytes)
+RECORDS = ".tektra-records.jsonl"
+
+class _EntryReader(io.RawIOBase):
+    """Archivo de solo lectura sobre una entrada del pack; read(n) copia solo n bytes"""
+
+    def __init__(self, view: memoryview):
+        self._view, self._pos = view, 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def readinto(self, buf) -> int:
+        chunk = self._view[self._pos:self._pos + len(buf)]
+        n = len(chunk)
+        buf[:n] = chunk
+        self._pos += n
+        return n
+
+class DayPack:
+    """Acceso aleatorio de solo lectura a un pack de día"""
+
+    def __init__(self, zip_path: Path):
+        self.path = zip_path
+        self.entries = _read_index(zip_path.with_suffix(".idx"))
+        self._file = open(zip_path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.mtime = zip_path.stat().st_mtime
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+    def names(self) -> list[str]:
+        return sorted(self.entries)
+
+    def read(self, name: str) -> memoryview:
+        """Contenido de una entrada como memoryview sobre el mmap (zero-copy)"""
+        off, size, _ = self.entries[name]
+        return memoryview(self._map)[off:off + size]
+
+    def open(self, name: str) -> _EntryReader:
+        """Entrada como archivo (seek/read por bloques), para servirla sin copiarla entera"""
+        return _EntryReader(self.read(name))
+
+    def crc(self, name: str) -> int:
+        return self.entries[name][2]
+
+    def records(self) -> list[dict]:
+        """Registros de scanner.py guardados al archivar (vacío en packs sin RECORDS)"""
+        if RECORDS not in self.entries:
+            return []
+        text = bytes(self.read(RECORDS)).decode("utf-8")
+        return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+def _read_index(idx_path: Path) -> dict:
+    data = idx_path.read_bytes()
+    magic, version, count = _HEADER.unpack_from(data, 0)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"Índice de pack inválido: {idx_path}")
+    names_at = _HEADER.size + count * _ENTRY.size
+    entries = {}
+    for off, size, crc, name_off, name_len in _ENTRY.iter_unpack(data[_HEADER.size:names_at]):
+        name = data[names_at + name_off:names_at + name_off + name_len].decode("utf-8")
+        entries[name] = (off, size, crc)
+    return entries
+
+def _write_index(zip_path: Path, idx_path: Path) -> None:
+    rows, names = [], bytearray()
+    with open(zip_path, "rb") as raw, zipfile.ZipFile(zip_path) as zf:
+        for info in sorted(zf.infolist(), key=lambda i: i.filename):
+            if info.is_dir():
+                continue
+            raw.seek(info.header_offset)
+            fields = _LOCAL_HEADER.unpack(raw.read(_LOCAL_HEADER.size))
+            if fields[0] != b"PK\x03\x04" or info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"Entrada no apta para acceso directo: {info.filename}")
+            name_len, extra_len = fields[9], fields[10]
+            data_off = info.header_offset + _LOCAL_HEADER.size + name_len + extra_len
+            encoded = info.filename.encode("utf-8")
+            rows.append((data_off, info.file_size, info.CRC, len(names), len(encoded)))
+            names += encoded
+    tmp = idx_path.with_suffix(".idx.tmp")
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, len(rows)))
+        for r in rows:
+            f.write(_ENTRY.pack(*r))
+        f.write(names)
+    os.replace(tmp, idx_path)
+
+def _verify(pack: DayPack, day_dir: Path) -> None:
+    for name in pack.names():
+        if name == RECORDS:
+            continue
+        src = day_dir / name
+        if zlib.crc32(pack.read(name)) != pack.crc(name) or src.stat().st_size != len(pack.read(name)):
+            raise ValueError(f"Verificación fallida para {name}")
+
+def archive_day(day_dir: Path, keep: bool = False) -> Path:
+    """Empaqueta output/<día>/ en output/<día>.zip + .idx; borra el directorio salvo keep"""
+    zip_path = day_dir.with_suffix(".zip")
+    tmp = day_dir.with_name(day_dir.name + ".zip.tmp")
+    records = scanner.scan_day(day_dir, day_dir.parent)
+    with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_STORED) as zf:
+        for base, dirs, files in os.walk(day_dir):
+            dirs.sort()
+            for fname in sorted(files):
+                full = Path(base) / fname
+                zf.write(full, full.relative_to(day_dir).as_posix())
+        zf.writestr(RECORDS, "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records))
+    os.replace(tmp, zip_path)
+    _write_index(zip_path, zip_path.with_suffix(".idx"))
+    pack = DayPack(zip_path)
+    try:
+        _verify(pack, day_dir)
+    finally:
+        pack.close()
+    if not keep:
+        shutil.rmtree(day_dir)
+    log.info("Día %s archivado en %s", day_dir.name, zip_path.name)
+    return zip_path
+
+def archive_older_than(output_root: Path, days: int, keep: bool = False) -> list[Path]:
+    cutoff = (dt.date.today() - dt.timedelta(days=days)).isoformat()
+    done = []
+    for day in sorted(output_root.iterdir()):
+        if day.is_dir() and scanner.DAY_RE.match(day.name) and day.name < cutoff:
+            done.append(archive_day(day, keep=keep))
+    return done
+
+# --- lectura desde el servidor y las herramientas ---
+_open_packs: dict[Path, DayPack] = {}
+_open_lock = threading.Lock()
+
+def open_pack(output_root: Path, day: str) -> DayPack | None:
+    """Pack del día (abierto una sola vez por proceso), o None si no existe"""
+    zip_path = output_root / f"{day}.zip"
+    with _open_lock:
+        pack = _open_packs.get(zip_path)
+        if not zip_path.exists() or not zip_path.with_suffix(".idx").exists():
+            return None
+        if pack is not None:
+            if pack.mtime == zip_path.stat().st_mtime:
+                return pack
+            # el pack se regeneró: se reabre; el mapeo viejo se libera cuando
+            # terminen las lecturas que todavía lo referencian
+        pack = _open_packs[zip_path] = DayPack(zip_path)
+        return pack
+
+def _hidden(member: str) -> bool:
+    return any(part.startswith(".") for part in member.split("/"))
+
+def lookup(output_root: Path, relpath: str) -> tuple[DayPack, str] | None:
+    """
+    Resuelve '<día>/<ruta>' dentro de un pack; un directorio resuelve a su
+    index.html. Los dot-files (RECORDS y cualquier otro) no son contenido
+    publicable y no se resuelven.
+    """
+    day, _, member = relpath.strip("/").partition("/")
+    if _hidden(member):
+        return None
+    pack = open_pack(output_root, day) if day else None
+    if pack is None:
+        return None
+    for name in (member, member.rstrip("/") + "/index.html"):
+        if name in pack:
+            return pack, name
+    return None
+
+def read(relpath: str, output_root: Path | None = None) -> bytes:
+    """Lee output/<día>/<ruta> desde el directorio o, si ya fue archivado, desde su pack"""
+    output_root = output_root or config.output_root()
+    p = output_root / relpath
+    if p.is_file():
+        return p.read_bytes()
+    hit = lookup(output_root, relpath)
+    if hit is None:
+        raise FileNotFoundError(relpath)
+    pack, name = hit
+    return bytes(pack.read(name))
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Packs por día de output/")
+    ap.add_argument("--output", type=Path, help="default: output.base_dir de config.yaml")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    ar = sub.add_parser("archive", help="empaquetar días más viejos que N")
+    ar.add_argument("--older-than", type=int, required=True, metavar="N")
+    ar.add_argument("--keep", action="store_true", help="no borrar los directorios empaquetados")
+    ls = sub.add_parser("ls", help="listar un pack")
+    ls.add_argument("day")
+    cat = sub.add_parser("cat", help="volcar una entrada a stdout")
+    cat.add_argument("relpath")
+    args = ap.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    root = (args.output or config.output_root()).resolve()
+
+    if args.cmd == "archive":
+        done = archive_older_than(root, args.older_than, keep=args.keep)
+        log.info("%d días archivados", len(done))
+    elif args.cmd == "ls":
+        pack = open_pack(root, args.day)
+        if pack is None:
+            sys.exit(f"No hay pack para {args.day}")
+        for name in pack.names():
+            print(f"{pack.entries[name][1]:>10}  {name}")
+    else:
+        sys.stdout.buffer.write(read(args.relpath, root))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Perfilado de factories con cProfile.
+
+FactoryProfiler.run() corre una factory bajo cProfile y deja, por factory:
+    <dir>/<nombre>.pstats   para pstats / snakeviz
+    <dir>/<nombre>.folded   stacks colapsados ("a;b;c <µs>") para flamegraph.pl / speedscope
+y devuelve el top-N de funciones por tiempo propio para el run_log.
+
+cProfile solo registra aristas caller → callee, así que los stacks se
+reconstruyen recorriendo ese grafo desde las raíces y repartiendo el tiempo
+de cada función entre sus callers en proporción al tiempo acumulado.
+
+Uso:  python profiling.py top log/profiles/<run>/website.pstats [-n 20]
+"""
+
+from __future__ import annotations
+from pathlib import Path
+import argparse, cProfile, pstats, sys
+
+ROOT = Path(__file__).parent.resolve()
+PROFILE_DIR = ROOT / "log" / "profiles"
+MAX_DEPTH = 64
+
+def _label(func: tuple) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name.strip("<>").replace(" ", "_")
+    try:
+        filename = Path(filename).resolve().relative_to(ROOT).as_posix()
+    except ValueError:
+        filename = Path(filename).name
+    return f"{name} ({filename}:{line})"
+
+def top_functions(stats: pstats.Stats, n: int = 15) -> list[dict]:
+    rows = sorted(stats.stats.items(), key=lambda kv: kv[1][2], reverse=True)[:n]
+    return [{"func": _label(f), "ncalls": nc, "tottime_ms": round(tt * 1e3, 3), "cumtime_ms": round(ct * 1e3, 3)}
+            for f, (cc, nc, tt, ct, callers) in rows]
+
+def folded_stacks(stats: pstats.Stats) -> list[str]:
+    """Líneas 'raíz;...;func <µs de tiempo propio>' reconstruidas del grafo de llamadas"""
+    children: dict[tuple, list[tuple]] = {}
+    for func, (_, _, _, ct, callers) in stats.stats.items():
+        for caller, edge in callers.items():
+            # edge = (cc, nc, tt, ct) de esta arista
+            share = edge[3] / ct if ct else 0.0
+            children.setdefault(caller, []).append((func, share))
+    roots = [f for f, v in stats.stats.items() if not v[4]]
+    acc: dict[str, float] = {}
+
+    def walk(func, path, weight, depth):
+        tt = stats.stats[func][2] * weight
+        label = _label(func)
+        stack = f"{path};{label}" if path else label
+        if tt > 0:
+            acc[stack] = acc.get(stack, 0.0) + tt
+        if depth >= MAX_DEPTH:
+            return
+        for child, share in children.get(func, ()):
+            # se poda lo que aporta menos de 1 µs y los ciclos de recursión
+            if weight * share * stats.stats[child][3] >= 1e-6 and label not in path.split(";"):
+                walk(child, stack, weight * share, depth + 1)
+
+    for root in roots:
+        walk(root, "", 1.0, 0)
+    return [f"{stack} {int(t * 1e6)}" for stack, t in sorted(acc.items()) if int(t * 1e6) > 0]
+
+class FactoryProfiler:
+    """Perfila cada factory de un ciclo; summaries[nombre] queda listo para el run_log"""
+
+    def __init__(self, out_dir: Path, top_n: int = 15):
+        self.out_dir, self.top_n = out_dir, top_n
+        self.summaries: dict[str, dict] = {}
+
+    def run(self, name: str, fn):
+        prof = cProfile.Profile()
+        try:
+            return prof.runcall(fn)
+        finally:
+            # también si la factory falló: el perfil de un error es el más útil
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            stats = pstats.Stats(prof)
+            pstats_path = self.out_dir / f"{name}.pstats"
+            folded_path = self.out_dir / f"{name}.folded"
+            stats.dump_stats(pstats_path)
+            folded_path.write_text("\n".join(folded_stacks(stats)) + "\n", encoding="utf-8")
+            self.summaries[name] = {
+                "pstats": _rel(pstats_path), "folded": _rel(folded_path),
+                "total_ms": round(stats.total_tt * 1e3, 3), "top": top_functions(stats, self.top_n),
+            }
+
+def _rel(p: Path) -> str:
+    try:
+        return p.relative_to(ROOT).as_posix()
+    except ValueError:
+        return p.as_posix()
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Herramientas sobre los perfiles de factories")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    t = sub.add_parser("top", help="top de funciones por tiempo propio")
+    t.add_argument("pstats_file", type=Path)
+    t.add_argument("-n", type=int, default=20)
+    f = sub.add_parser("fold", help="regenerar stacks colapsados desde un .pstats")
+    f.add_argument("pstats_file", type=Path)
+    args = ap.parse_args(argv)
+    stats = pstats.Stats(str(args.pstats_file))
+    if args.cmd == "top":
+        for r in top_functions(stats, args.n):
+            print(f"{r['tottime_ms']:>10.3f} ms {r['cumtime_ms']:>10.3f} ms {r['ncalls']:>8}  {r['func']}")
+    else:
+        sys.stdout.write("\n".join(folded_stacks(stats)) + "\n")
+
+if __name__ == "__main__":
+    main()
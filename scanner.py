@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Scanner de output/ que reconoce todos los formatos históricos.
+
+Cada día se lista con os.scandir en un thread pool y cada entrada se
+clasifica y normaliza a un único registro:
+
+    {"kind", "title", "path", "ts", "meta"}
+
+donde meta conserva los campos originales (metadata.json o el
+_metadata.json del trío de prompt) y agrega siempre:
+
+    era         note | placeholder | prompt_trio | image_dir | site | web | web_auto | game
+    format      md | svg | png | txt | html | ...
+    size_bytes  tamaño total del archivo o directorio
+
+Los resultados se entregan como generador, con a lo sumo 2×workers días en
+vuelo, así backfill, catálogo e índices los consumen con memoria acotada.
+Los días ya archivados por packs.py (<día>.zip) se leen de los registros
+que el pack guarda al archivarse.
+
+Uso:  python scanner.py [--output DIR] [--since-mtime T]   # JSON lines a stdout
+"""
+
+from __future__ import annotations
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import argparse, datetime as dt, json, os, re, sys
+
+import config
+
+ROOT = Path(__file__).parent.resolve()
+
+DAY_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+# hora HHMMSS al final del nombre: note_161155.md, game_orb-catcher_203758
+_STAMP_RE = re.compile(r"_(\d{2})(\d{2})(\d{2})(?:\.[^.]+)?$")
+_KIND_BY_TYPE = {"website": "websites", "game": "games", "image": "images", "image_prompt": "images"}
+# el orden importa: web_auto- antes que web_
+_DIR_PREFIXES = (
+    ("web_auto-", "websites", "web_auto"),
+    ("web_", "websites", "web"),
+    ("site_", "websites", "site"),
+    ("game_", "games", "game"),
+    ("img_", "images", "image_dir"),
+)
+_IMAGE_EXTS = {".svg", ".png", ".jpg", ".jpeg", ".webp", ".gif"}
+# archivos que acompañan a un item o al día pero no son items
+_AUX_SUFFIXES = ("_metadata.json", "_README.md")
+_AUX_NAMES = {"AUTO_NOTE.md", "CHANGELOG.txt", "run_log.json", "manifest.jsonl", "metadata.json"}
+
+def _read_json(p: str) -> dict:
+    try:
+        with open(p, encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def _tree_size(path: str) -> int:
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False):
+                        stack.append(e.path)
+                    else:
+                        try:
+                            total += e.stat(follow_symlinks=False).st_size
+                        except OSError:
+                            pass
+        except OSError:
+            pass
+    return total
+
+def _ts(meta: dict, path: str, mtime: float) -> str:
+    """
+    created_at de la metadata; si no hay, el día del directorio más la hora
+    HHMMSS del nombre (o 00:00:00). El mtime solo como último recurso: en un
+    checkout nuevo es la hora del checkout, no la del item.
+    """
+    raw = meta.get("created_at")
+    if isinstance(raw, str):
+        try:
+            t = dt.datetime.fromisoformat(raw.replace("Z", "+00:00"))
+            if t.tzinfo:
+                t = t.astimezone().replace(tzinfo=None)
+            return t.isoformat()
+        except ValueError:
+            pass
+    day = os.path.basename(os.path.dirname(path))
+    if DAY_RE.match(day):
+        m = _STAMP_RE.search(os.path.basename(path))
+        h, mi, s = map(int, m.groups()) if m else (0, 0, 0)
+        if h > 23 or mi > 59 or s > 59:
+            h = mi = s = 0   # el sufijo no era una hora (p. ej. game_snake_446719)
+        try:
+            return dt.datetime.fromisoformat(day).replace(hour=h, minute=mi, second=s).isoformat()
+        except ValueError:
+            pass
+    return dt.datetime.fromtimestamp(mtime).isoformat()
+
+def classify(entry, output_root: Path | None = None) -> dict | None:
+    """Registro normalizado para una entrada de output/<día>/ (os.DirEntry o Path), o None"""
+    output_root = output_root or config.output_root()
+    path = os.fspath(entry.path if isinstance(entry, os.DirEntry) else entry)
+    name = os.path.basename(path)
+    is_dir = entry.is_dir() if isinstance(entry, os.DirEntry) else os.path.isdir(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+
+    if is_dir:
+        meta = _read_json(os.path.join(path, "metadata.json"))
+        kind, era = next(((k, e) for p, k, e in _DIR_PREFIXES if name.startswith(p)), (None, None))
+        kind = _KIND_BY_TYPE.get(str(meta.get("type", ""))) or kind
+        if not kind:
+            return None
+        era = era or kind
+        concept = meta.get("concept") if isinstance(meta.get("concept"), dict) else {}
+        title = meta.get("title") or concept.get("name") or name
+        fmt = "html"
+        if kind == "images":
+            exts = sorted({os.path.splitext(f)[1] for f in os.listdir(path)} & _IMAGE_EXTS)
+            fmt = exts[0].lstrip(".") if exts else "dir"
+        size = _tree_size(path)
+    elif name in _AUX_NAMES or name.endswith(_AUX_SUFFIXES):
+        return None
+    elif name.startswith("note_") and name.endswith(".md"):
+        kind, era, fmt, meta, title = "notes", "note", "md", {}, name
+        size = st.st_size
+    elif name.startswith("img_"):
+        stem, ext = os.path.splitext(name)
+        if ext == ".txt":
+            meta = _read_json(os.path.join(os.path.dirname(path), stem + "_metadata.json"))
+            subject = (meta.get("components") or {}).get("subject")
+            era, title = "prompt_trio", f"Imagen — {subject}" if subject else name
+        elif ext.lower() in _IMAGE_EXTS:
+            meta, era, title = {}, "placeholder", name
+        else:
+            return None
+        kind, fmt, size = "images", ext.lstrip(".").lower(), st.st_size
+    else:
+        return None
+
+    meta = dict(meta)
+    meta.update({"era": era, "format": fmt, "size_bytes": size})
+    try:
+        rel = Path(path).relative_to(output_root.parent).as_posix()
+    except ValueError:
+        rel = Path(path).as_posix()
+    return {"kind": kind, "title": str(title), "path": rel, "ts": _ts(meta, path, st.st_mtime), "meta": meta}
+
+def day_dirs(output_root: Path | None = None, min_mtime: float = 0.0) -> list[tuple[Path, float]]:
+    """Directorios de día (YYYY-MM-DD) con mtime >= min_mtime, en orden"""
+    output_root = output_root or config.output_root()
+    out = []
+    with os.scandir(output_root) as it:
+        for e in it:
+            if DAY_RE.match(e.name) and e.is_dir():
+                m = e.stat().st_mtime
+                if m >= min_mtime:
+                    out.append((Path(e.path), m))
+    return sorted(out)
+
+def day_sources(output_root: Path | None = None, min_mtime: float = 0.0) -> list[tuple[Path, float]]:
+    """
+    Días con mtime >= min_mtime, en orden: directorios YYYY-MM-DD y packs
+    YYYY-MM-DD.zip (con su .idx). Si un día está en los dos (archive --keep),
+    gana el directorio.
+    """
+    output_root = output_root or config.output_root()
+    dirs, zips = {}, {}
+    with os.scandir(output_root) as it:
+        for e in it:
+            if DAY_RE.match(e.name) and e.is_dir():
+                dirs[e.name] = (Path(e.path), e.stat().st_mtime)
+            elif e.name.endswith(".zip") and DAY_RE.match(e.name[:-4]) and os.path.exists(e.path[:-4] + ".idx"):
+                zips[e.name[:-4]] = (Path(e.path), e.stat().st_mtime)
+    merged = {**zips, **dirs}
+    return [merged[d] for d in sorted(merged) if merged[d][1] >= min_mtime]
+
+def day_name(day: Path) -> str:
+    """'2025-09-12' tanto para output/2025-09-12/ como para output/2025-09-12.zip"""
+    return day.stem if day.suffix == ".zip" else day.name
+
+def scan_day(day: Path, output_root: Path | None = None) -> list[dict]:
+    """Registros de un día, desde su directorio o desde su pack"""
+    output_root = output_root or config.output_root()
+    if day.suffix == ".zip":
+        import packs   # packs importa scanner
+        pack = packs.open_pack(output_root, day.stem)
+        return pack.records() if pack is not None else []
+    with os.scandir(day) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    return [r for r in (classify(e, output_root) for e in entries) if r]
+
+def scan_by_day(output_root: Path | None = None, min_mtime: float = 0.0, workers: int | None = None,
+                days: list[tuple[Path, float]] | None = None):
+    """Genera (día, mtime, registros) en orden de día, escaneando varios días en paralelo"""
+    output_root = output_root or config.output_root()
+    workers = workers or min(8, (os.cpu_count() or 2) * 2)
+    days = iter(days if days is not None else day_sources(output_root, min_mtime))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tektra-scan") as ex:
+        window = deque()
+
+        def _submit():
+            nxt = next(days, None)
+            if nxt is not None:
+                window.append((nxt, ex.submit(scan_day, nxt[0], output_root)))
+
+        for _ in range(workers * 2):
+            _submit()
+        while window:
+            (day, mtime), fut = window.popleft()
+            _submit()
+            yield day_name(day), mtime, fut.result()
+
+def scan(output_root: Path | None = None, min_mtime: float = 0.0, workers: int | None = None):
+    """Genera los registros normalizados de todos los días"""
+    output_root = output_root or config.output_root()
+    for _, _, records in scan_by_day(output_root, min_mtime, workers):
+        yield from records
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Escanea output/ y emite registros normalizados (JSON lines)")
+    ap.add_argument("--output", type=Path, help="default: output.base_dir de config.yaml")
+    ap.add_argument("--since-mtime", type=float, default=0.0)
+    ap.add_argument("--workers", type=int)
+    args = ap.parse_args(argv)
+    for rec in scan((args.output or config.output_root()).resolve(), args.since_mtime, args.workers):
+        sys.stdout.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+if __name__ == "__main__":
+    main()
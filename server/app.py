@@ -1,21 +1,460 @@
-from flask import Flask, jsonify
-import sqlite3, os
+from flask import Flask, Response, abort, jsonify, redirect, request, send_file
+from werkzeug.security import safe_join
+from werkzeug.wsgi import wrap_file
+from contextlib import contextmanager
+from pathlib import Path
+import sqlite3, os, sys, queue, threading, time, logging, functools, json, mimetypes, re, zlib, datetime as dt
+from collections import OrderedDict, deque
+from urllib.parse import urlencode
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+import config, statusdb, packs
 
 app = Flask(__name__)
 DB = os.environ.get("STATUS_DB", "./log/status.db")
+POOL_SIZE = int(os.environ.get("STATUS_DB_POOL", "8"))
+PAGE_DEFAULT, PAGE_MAX = 50, 500
+CACHE_ENTRIES = 256
+VERSION_TTL = float(os.environ.get("STATUS_VERSION_TTL", "1.0"))   # seg. entre chequeos de MAX(id)
+STREAM_POLL = float(os.environ.get("STATUS_STREAM_POLL", "1.0"))    # seg. entre chequeos del watcher
+STREAM_BUFFER = 1000      # últimos eventos en memoria para reanudar con Last-Event-ID
+STREAM_KEEPALIVE = 15.0
+STATIC_MAX_AGE = 3600
+IMMUTABLE_MAX_AGE = 31536000
+PACK_CHUNK = 64 * 1024
+# nombres con un hash de contenido (p. ej. output/_atlas/<sha1>.png) nunca cambian
+_HASHED_NAME = re.compile(r"(^|[._-])[0-9a-f]{12,}([._-]|$)")
+log = logging.getLogger("tektra.server")
+
+# Pool de conexiones de solo lectura. Es LIFO para reutilizar siempre las
+# conexiones más "calientes" (cache de páginas y statements ya preparados).
+# No usamos threading.local a secas porque el servidor de desarrollo crea un
+# hilo por request y esas conexiones no se reutilizarían nunca.
+_pool = queue.LifoQueue(maxsize=POOL_SIZE)
+_stats_lock = threading.Lock()
+_stats = {"opened": 0, "queries": {}}
+
+class _PooledConnection(sqlite3.Connection):
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.prepared = set()   # SQL ya compilado en el statement cache de esta conexión
+
+def _migrate():
+    # journal_mode e índices persisten en el archivo: se fijan una vez con una conexión de escritura
+    try:
+        con = statusdb.connect(DB)
+        statusdb.ensure_schema(con)
+        con.close()
+    except sqlite3.Error as e:
+        log.warning("No se pudo preparar %s: %s", DB, e)
+
+def _open():
+    uri = Path(DB).resolve().as_uri() + "?mode=ro"
+    con = sqlite3.connect(uri, uri=True, factory=_PooledConnection,
+                          check_same_thread=False, cached_statements=64)
+    con.row_factory = sqlite3.Row
+    con.execute("PRAGMA query_only = ON")
+    con.execute("PRAGMA cache_size = -8192")      # 8 MiB por conexión
+    con.execute("PRAGMA mmap_size = 67108864")    # 64 MiB mapeados
+    with _stats_lock:
+        _stats["opened"] += 1
+    return con
+
+@contextmanager
+def _conn():
+    try:
+        con = _pool.get_nowait()
+    except queue.Empty:
+        con = _open()
+    try:
+        yield con
+    finally:
+        try:
+            _pool.put_nowait(con)
+        except queue.Full:
+            con.close()
+
+def _record(sql, warm, elapsed):
+    with _stats_lock:
+        s = _stats["queries"].setdefault(sql, {"cold": 0, "cold_ms": 0.0, "warm": 0, "warm_ms": 0.0})
+        key = "warm" if warm else "cold"
+        s[key] += 1
+        s[key + "_ms"] += elapsed * 1000
 
 def q(sql, args=()):
-    con = sqlite3.connect(DB); con.row_factory = sqlite3.Row
-    cur = con.cursor(); cur.execute(sql, args)
-    rows = [dict(r) for r in cur.fetchall()]
-    con.close(); return rows
+    with _conn() as con:
+        warm = sql in con.prepared
+        t0 = time.perf_counter()
+        rows = [dict(r) for r in con.execute(sql, args).fetchall()]
+        _record(sql, warm, time.perf_counter() - t0)
+        con.prepared.add(sql)
+    return rows
+
+_migrate()
+
+# --- cache de respuestas invalidado por MAX(id) ---
+class _ResponseCache:
+    def __init__(self, size):
+        self.size = size
+        self.lock = threading.Lock()
+        self.version = None
+        self.checked = 0.0
+        self.entries = OrderedDict()
+
+    def current_version(self):
+        """(max_id, ts) del último item; se consulta como mucho cada VERSION_TTL segundos"""
+        now = time.monotonic()
+        with self.lock:
+            if self.version is not None and now - self.checked < VERSION_TTL:
+                return self.version
+        last = q("SELECT id, ts FROM items ORDER BY id DESC LIMIT 1")
+        ver = (last[0]["id"], last[0]["ts"]) if last else (0, None)
+        with self.lock:
+            if ver != self.version:
+                self.entries.clear()
+            self.version, self.checked = ver, now
+        return ver
+
+    def get(self, key):
+        with self.lock:
+            hit = self.entries.get(key)
+            if hit is not None:
+                self.entries.move_to_end(key)
+            return hit
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = value
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+_cache = _ResponseCache(CACHE_ENTRIES)
+_CACHED_HEADERS = ("Link", "X-Next-Before-Id")
+
+def _last_modified(ts):
+    if not ts:
+        return None
+    try:
+        return dt.datetime.fromisoformat(ts).astimezone(dt.timezone.utc)
+    except ValueError:
+        return None
+
+def cached(view):
+    """Cachea la respuesta por endpoint + parámetros y responde 304 a If-None-Match"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        max_id, ts = _cache.current_version()
+        key = (request.path, tuple(sorted(request.args.items(multi=True))))
+        etag = f"{max_id}-{zlib.crc32(repr(key).encode()):08x}"
+        if request.if_none_match.contains(etag):
+            resp = app.response_class(status=304)
+        else:
+            hit = _cache.get(key)
+            if hit is None:
+                fresh = app.make_response(view(*args, **kwargs))
+                if fresh.status_code != 200:
+                    return fresh
+                hit = (fresh.get_data(), fresh.mimetype,
+                       {h: fresh.headers[h] for h in _CACHED_HEADERS if h in fresh.headers})
+                if _cache.version == (max_id, ts):
+                    _cache.put(key, hit)
+            resp = app.response_class(hit[0], mimetype=hit[1], headers=hit[2])
+        resp.set_etag(etag)
+        resp.last_modified = _last_modified(ts)
+        resp.headers["Cache-Control"] = "no-cache"
+        return resp
+    return wrapper
+
+class BadRequest(ValueError):
+    pass
+
+@app.errorhandler(BadRequest)
+def _bad_request(e):
+    return jsonify({"error": str(e)}), 400
+
+def _int_arg(name, default=None, lo=None, hi=None):
+    raw = request.args.get(name)
+    if raw is None or raw == "":
+        return default
+    try:
+        v = int(raw)
+    except ValueError:
+        raise BadRequest(f"'{name}' debe ser un entero")
+    if lo is not None and v < lo:
+        raise BadRequest(f"'{name}' debe ser >= {lo}")
+    return min(v, hi) if hi is not None else v
+
+def _date_arg(name, end=False):
+    # acepta YYYY-MM-DD o ISO completo; una fecha sola como 'until' incluye todo el día
+    raw = request.args.get(name)
+    if not raw:
+        return None
+    try:
+        if len(raw) == 10:
+            d = dt.date.fromisoformat(raw)
+            return (d + dt.timedelta(days=1)).isoformat() if end else d.isoformat()
+        return dt.datetime.fromisoformat(raw).isoformat()
+    except ValueError:
+        raise BadRequest(f"'{name}' debe ser una fecha ISO (YYYY-MM-DD)")
+
+def _items_page(args):
+    """SELECT de una página por keyset (id descendente) con filtros opcionales"""
+    where, params = [], []
+    if args["kind"]:
+        where.append("kind = ?"); params.append(args["kind"])
+    if args["before_id"] is not None:
+        where.append("id < ?"); params.append(args["before_id"])
+    if args["since"]:
+        where.append("ts >= ?"); params.append(args["since"])
+    if args["until"]:
+        where.append("ts < ?"); params.append(args["until"])
+    sql = "SELECT id, ts, kind, title, path, cost FROM items"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY id DESC LIMIT ?"
+    return q(sql, (*params, args["limit"]))
 
 @app.get("/novedades")
+@cached
 def novedades():
-    rows = q("SELECT id, ts, kind, title, path, cost FROM items ORDER BY id DESC LIMIT 50")
-    return jsonify(rows)
+    args = {
+        "kind": request.args.get("kind") or None,
+        "before_id": _int_arg("before_id", lo=1),
+        "since": _date_arg("since"),
+        "until": _date_arg("until", end=True),
+        "limit": _int_arg("limit", PAGE_DEFAULT, lo=1, hi=PAGE_MAX),
+    }
+    rows = _items_page(args)
+    resp = jsonify(rows)
+    if len(rows) == args["limit"]:
+        # cursor para la página siguiente: mismo filtro, before_id = último id visto
+        nxt = {k: v for k, v in request.args.items() if k != "before_id"}
+        nxt["before_id"] = rows[-1]["id"]
+        resp.headers["X-Next-Before-Id"] = str(rows[-1]["id"])
+        resp.headers["Link"] = f'<{request.path}?{urlencode(nxt)}>; rel="next"'
+    return resp
 
 @app.get("/quehaces")
+@cached
 def quehaces():
     last = q("SELECT ts, kind, title FROM items ORDER BY id DESC LIMIT 1")
     return jsonify(last[0] if last else {"status":"inicializando"})
+
+# --- búsqueda full-text (FTS5) ---
+SEARCH_DEFAULT, SEARCH_MAX = 20, 100
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+def _fts_query(text):
+    # cada palabra como frase literal (sin operadores FTS5 del usuario); prefijo en la última
+    words = _WORD.findall(text)
+    if not words:
+        raise BadRequest("'q' no contiene palabras para buscar")
+    terms = [f'"{w}"' for w in words[:16]]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+@app.get("/buscar")
+@cached
+def buscar():
+    match = _fts_query(request.args.get("q", ""))
+    limit = _int_arg("limit", SEARCH_DEFAULT, lo=1, hi=SEARCH_MAX)
+    kind = request.args.get("kind") or None
+    # bm25: el título pesa más que el prompt, y el prompt más que el resto de la metadata
+    sql = ("SELECT i.id, i.ts, i.kind, i.title, i.path, "
+           "snippet(items_fts, -1, '<mark>', '</mark>', '…', 12) AS snippet, "
+           "bm25(items_fts, 10.0, 1.0, 4.0) AS rank "
+           "FROM items_fts JOIN items i ON i.id = items_fts.rowid "
+           "WHERE items_fts MATCH ?")
+    params = [match]
+    if kind:
+        sql += " AND i.kind = ?"; params.append(kind)
+    sql += " ORDER BY rank LIMIT ?"
+    return jsonify(q(sql, (*params, limit)))
+
+# --- estadísticas desde daily_rollup (nunca desde items) ---
+_STATS_GROUPS = {
+    "day": ("day, kind", "day, kind"),
+    "kind": ("kind", "kind"),
+    "palette": ("kind, palette", "kind, palette"),
+}
+
+@app.get("/stats")
+@cached
+def stats():
+    group = request.args.get("group", "day")
+    if group not in _STATS_GROUPS:
+        raise BadRequest(f"'group' debe ser uno de: {', '.join(_STATS_GROUPS)}")
+    since = _date_arg("since")
+    until = _date_arg("until", end=True)
+    kind = request.args.get("kind") or None
+    cols, order = _STATS_GROUPS[group]
+    where, params = [], []
+    if since:
+        where.append("day >= ?"); params.append(since[:10])
+    if until:
+        where.append("day < ?"); params.append(until[:10])
+    if kind:
+        where.append("kind = ?"); params.append(kind)
+    sql = (f"SELECT {cols}, SUM(n) AS count, SUM(cost) AS cost, SUM(bytes) AS bytes, "
+           f"CAST(SUM(bytes) AS REAL) / SUM(n) AS avg_bytes FROM daily_rollup")
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" GROUP BY {cols} HAVING SUM(n) > 0 ORDER BY {order}"
+    return jsonify({"group": group, "since": request.args.get("since"), "until": request.args.get("until"),
+                    "kind": kind, "rows": q(sql, params)})
+
+# --- SSE: un único watcher lee filas nuevas y las reparte a todos los clientes ---
+_ITEM_COLS = "id, ts, kind, title, path, cost"
+
+class _Broadcaster:
+    def __init__(self, size):
+        self.cond = threading.Condition()
+        self.events = deque(maxlen=size)
+        self.last_id = 0
+        self.floor = 0        # el buffer cubre todos los ids > floor
+        self.thread = None
+
+    def ensure_started(self):
+        with self.cond:
+            if self.thread is None:
+                last = q("SELECT MAX(id) AS m FROM items")
+                self.last_id = self.floor = (last[0]["m"] if last else None) or 0
+                self.thread = threading.Thread(target=self._run, name="tektra-stream", daemon=True)
+                self.thread.start()
+
+    def _run(self):
+        con = _open()
+        data_version = None
+        while True:
+            try:
+                # PRAGMA data_version cambia solo cuando otra conexión hace commit:
+                # sin cambios no se toca la tabla
+                dv = con.execute("PRAGMA data_version").fetchone()[0]
+                if dv != data_version:
+                    data_version = dv
+                    rows = [dict(r) for r in con.execute(
+                        f"SELECT {_ITEM_COLS} FROM items WHERE id > ? ORDER BY id LIMIT 500", (self.last_id,))]
+                    if rows:
+                        with self.cond:
+                            self.events.extend(rows)
+                            self.last_id = rows[-1]["id"]
+                            if len(self.events) == self.events.maxlen:
+                                self.floor = self.events[0]["id"] - 1
+                            self.cond.notify_all()
+                        if len(rows) == 500:
+                            data_version = None   # quedan filas: releer sin esperar
+                            continue
+            except sqlite3.Error as e:
+                log.warning("Watcher de /stream: %s", e)
+            time.sleep(STREAM_POLL)
+
+    def wait_after(self, after_id, timeout):
+        """Eventos con id > after_id; bloquea hasta `timeout` si no hay ninguno"""
+        with self.cond:
+            if after_id >= self.floor:
+                self.cond.wait_for(lambda: self.last_id > after_id, timeout)
+                return [e for e in self.events if e["id"] > after_id]
+        # el cliente quedó más atrás que el buffer: una consulta solo para él
+        return q(f"SELECT {_ITEM_COLS} FROM items WHERE id > ? ORDER BY id LIMIT 500", (after_id,))
+
+_broadcaster = _Broadcaster(STREAM_BUFFER)
+
+def _sse(event):
+    return f"id: {event['id']}\nevent: item\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+@app.get("/stream")
+def stream():
+    _broadcaster.ensure_started()
+    # EventSource manda Last-Event-ID al reconectar; ?last_id= sirve para la primera conexión
+    raw = request.headers.get("Last-Event-ID") or request.args.get("last_id")
+    try:
+        after = int(raw) if raw else _broadcaster.last_id
+    except ValueError:
+        raise BadRequest("'Last-Event-ID' debe ser un entero")
+
+    def gen(after_id):
+        yield "retry: 3000\n\n"
+        while True:
+            events = _broadcaster.wait_after(after_id, STREAM_KEEPALIVE)
+            if not events:
+                yield ": ping\n\n"
+                continue
+            for ev in events:
+                yield _sse(ev)
+            after_id = events[-1]["id"]
+
+    return Response(gen(after), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+# --- archivos generados en output/ ---
+@app.get("/output/")
+@app.get("/output/<path:relpath>")
+def output_file(relpath=""):
+    # la raíz se resuelve por request: sigue a las recargas de output.base_dir
+    target = safe_join(str(config.output_root()), relpath)
+    if target is None:
+        abort(404)
+    path = Path(target)
+    if path.is_dir():
+        if relpath and not relpath.endswith("/"):
+            # sin la barra final los links relativos del sitio apuntarían al directorio padre
+            return redirect(request.path + "/", 308)
+        path = path / "index.html"
+    if not path.is_file():
+        return _packed_file(relpath)
+
+    mimetype = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    gz = path.with_name(path.name + ".gz")
+    has_gz = gz.is_file()
+    use_gz = has_gz and request.accept_encodings["gzip"] > 0
+    immutable = bool(_HASHED_NAME.search(path.stem))
+
+    # send_file entrega el archivo por bloques (wsgi.file_wrapper), resuelve
+    # Range/If-Range con 206/416 y responde 304 a ETag/If-Modified-Since
+    resp = send_file(gz if use_gz else path, mimetype=mimetype, download_name=path.name,
+                     conditional=True, etag=True,
+                     max_age=IMMUTABLE_MAX_AGE if immutable else STATIC_MAX_AGE)
+    if use_gz:
+        resp.headers["Content-Encoding"] = "gzip"
+    if has_gz:
+        resp.vary.add("Accept-Encoding")
+    resp.cache_control.public = True
+    if immutable:
+        resp.cache_control.immutable = True
+    return resp
+
+def _packed_file(relpath):
+    # días archivados: la entrada se sirve desde el mmap del pack, sin extraerla;
+    # los dot-files (p. ej. los registros internos de scanner) no se publican
+    hit = packs.lookup(config.output_root(), relpath)
+    if hit is None or hit[1] == packs.RECORDS or any(p.startswith(".") for p in hit[1].split("/")):
+        abort(404)
+    pack, name = hit
+    if name != relpath.strip("/").partition("/")[2] and not relpath.endswith("/"):
+        return redirect(request.path + "/", 308)
+    mimetype = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    # la entrada se entrega por bloques desde el mmap; un Range solo lee su tramo
+    size = pack.entries[name][1]
+    resp = Response(wrap_file(request.environ, pack.open(name), PACK_CHUNK), mimetype=mimetype,
+                    direct_passthrough=True)
+    resp.content_length = size
+    resp.set_etag(f"{pack.path.stem}-{pack.crc(name):08x}")
+    resp.last_modified = dt.datetime.fromtimestamp(pack.mtime, dt.timezone.utc)
+    resp.cache_control.public = True
+    resp.cache_control.max_age = STATIC_MAX_AGE
+    return resp.make_conditional(request, accept_ranges=True, complete_length=size)
+
+@app.get("/debug/db")
+def debug_db():
+    # tiempo medio de la primera ejecución (prepare) vs. reutilizando el statement
+    with _stats_lock:
+        out = {"pool_size": POOL_SIZE, "idle": _pool.qsize(), "opened": _stats["opened"], "queries": []}
+        for sql, s in _stats["queries"].items():
+            out["queries"].append({
+                "sql": sql,
+                "cold": s["cold"], "cold_avg_ms": round(s["cold_ms"] / s["cold"], 3) if s["cold"] else None,
+                "warm": s["warm"], "warm_avg_ms": round(s["warm_ms"] / s["warm"], 3) if s["warm"] else None,
+            })
+    return jsonify(out)
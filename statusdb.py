@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Esquema y conexiones de log/status.db, compartido por el servidor y el orchestrator.
+"""
+
+from __future__ import annotations
+from pathlib import Path
+import os, sqlite3, json, datetime as dt
+
+ROOT = Path(__file__).parent.resolve()
+DEFAULT_DB = os.environ.get("STATUS_DB", str(ROOT / "log" / "status.db"))
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS items (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ts TEXT, kind TEXT, title TEXT, path TEXT, cost REAL DEFAULT 0.0, meta TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS counters (
+        day TEXT PRIMARY KEY, cost REAL, images INT, websites INT, games INT
+    )""",
+    # paginación por keyset: cada página es un range scan sobre estos índices
+    "CREATE INDEX IF NOT EXISTS items_kind_id ON items(kind, id)",
+    "CREATE INDEX IF NOT EXISTS items_ts ON items(ts)",
+    # backfill: saber qué rutas de un día ya están cargadas sin recorrer la tabla
+    "CREATE INDEX IF NOT EXISTS items_path ON items(path)",
+    """CREATE TABLE IF NOT EXISTS ingest_state (
+        key TEXT PRIMARY KEY, value TEXT
+    )""",
+]
+
+# Búsqueda full-text. items_fts es external-content sobre la vista items_search:
+# no duplica el texto, y los triggers mantienen el índice al insertar/borrar.
+# 'meta' indexa solo los valores de texto del JSON (no las claves).
+_META_TEXT = "(SELECT group_concat(value, ' ') FROM json_tree({m}) WHERE type = 'text')"
+_SEARCH_COLS = ("{p}.title, CASE WHEN json_valid({p}.meta) THEN " + _META_TEXT.format(m="{p}.meta") + " END, "
+                "CASE WHEN json_valid({p}.meta) THEN json_extract({p}.meta, '$.prompt') END")
+
+FTS_SCHEMA = [
+    "CREATE VIEW IF NOT EXISTS items_search(id, title, meta, prompt) AS "
+    "SELECT items.id, " + _SEARCH_COLS.format(p="items") + " FROM items",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5("
+    "title, meta, prompt, content='items_search', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS items_fts_ai AFTER INSERT ON items BEGIN "
+    "INSERT INTO items_fts(rowid, title, meta, prompt) VALUES (new.id, " + _SEARCH_COLS.format(p="new") + "); END",
+    "CREATE TRIGGER IF NOT EXISTS items_fts_ad AFTER DELETE ON items BEGIN "
+    "INSERT INTO items_fts(items_fts, rowid, title, meta, prompt) VALUES ('delete', old.id, "
+    + _SEARCH_COLS.format(p="old") + "); END",
+    "CREATE TRIGGER IF NOT EXISTS items_fts_au AFTER UPDATE ON items BEGIN "
+    "INSERT INTO items_fts(items_fts, rowid, title, meta, prompt) VALUES ('delete', old.id, "
+    + _SEARCH_COLS.format(p="old") + "); "
+    "INSERT INTO items_fts(rowid, title, meta, prompt) VALUES (new.id, " + _SEARCH_COLS.format(p="new") + "); END",
+]
+
+# Rollups materializados: se actualizan por trigger en cada insert/delete de
+# items (y en un update de las columnas que agregan: se resta la fila vieja y
+# se suma la nueva), así /stats agrega filas por día y nunca recorre la tabla cruda.
+_DAY = "substr({p}.ts, 1, 10)"
+_PALETTE = "coalesce(CASE WHEN json_valid({p}.meta) THEN json_extract({p}.meta, '$.palette.name') END, '')"
+_BYTES = "coalesce(CASE WHEN json_valid({p}.meta) THEN json_extract({p}.meta, '$.size_bytes') END, 0)"
+
+def _rollup_upsert(p: str, sign: str) -> str:
+    return (
+        f"INSERT INTO daily_rollup(day, kind, palette, n, cost, bytes) VALUES ("
+        f"{_DAY.format(p=p)}, coalesce({p}.kind, ''), {_PALETTE.format(p=p)}, {sign}1, "
+        f"{sign}coalesce({p}.cost, 0), {sign}{_BYTES.format(p=p)}) "
+        f"ON CONFLICT(day, kind, palette) DO UPDATE SET n = n + excluded.n, "
+        f"cost = cost + excluded.cost, bytes = bytes + excluded.bytes; "
+        f"INSERT INTO counters(day, cost, images, websites, games) VALUES ("
+        f"{_DAY.format(p=p)}, {sign}coalesce({p}.cost, 0), {sign}(coalesce({p}.kind, '') = 'images'), "
+        f"{sign}(coalesce({p}.kind, '') = 'websites'), {sign}(coalesce({p}.kind, '') = 'games')) "
+        f"ON CONFLICT(day) DO UPDATE SET cost = coalesce(cost, 0) + excluded.cost, "
+        f"images = coalesce(images, 0) + excluded.images, websites = coalesce(websites, 0) + excluded.websites, "
+        f"games = coalesce(games, 0) + excluded.games;"
+    )
+
+ROLLUP_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS daily_rollup (
+        day TEXT, kind TEXT, palette TEXT, n INT, cost REAL, bytes INT,
+        PRIMARY KEY (day, kind, palette)
+    ) WITHOUT ROWID""",
+    "CREATE TRIGGER IF NOT EXISTS items_rollup_ai AFTER INSERT ON items BEGIN "
+    + _rollup_upsert("new", "") + " END",
+    "CREATE TRIGGER IF NOT EXISTS items_rollup_ad AFTER DELETE ON items BEGIN "
+    + _rollup_upsert("old", "-") + " END",
+    "CREATE TRIGGER IF NOT EXISTS items_rollup_au AFTER UPDATE OF ts, kind, cost, meta ON items BEGIN "
+    + _rollup_upsert("old", "-") + " " + _rollup_upsert("new", "") + " END",
+]
+
+_ROLLUP_REBUILD = [
+    "DELETE FROM daily_rollup",
+    "INSERT INTO daily_rollup(day, kind, palette, n, cost, bytes) "
+    "SELECT " + _DAY.format(p="items") + ", coalesce(kind, ''), " + _PALETTE.format(p="items")
+    + ", count(*), sum(coalesce(cost, 0)), sum(" + _BYTES.format(p="items") + ") FROM items GROUP BY 1, 2, 3",
+    # counters puede tener costos cargados por fuera de items: solo se pisan los conteos
+    "INSERT INTO counters(day, cost, images, websites, games) "
+    "SELECT day, sum(cost), sum(CASE WHEN kind = 'images' THEN n ELSE 0 END), "
+    "sum(CASE WHEN kind = 'websites' THEN n ELSE 0 END), sum(CASE WHEN kind = 'games' THEN n ELSE 0 END) "
+    "FROM daily_rollup WHERE true GROUP BY day "
+    "ON CONFLICT(day) DO UPDATE SET images = excluded.images, websites = excluded.websites, games = excluded.games",
+]
+
+def connect(path: str | None = None) -> sqlite3.Connection:
+    """Conexión de escritura con WAL activado"""
+    con = sqlite3.connect(path or DEFAULT_DB)
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")
+    return con
+
+def _exists(con: sqlite3.Connection, name: str) -> bool:
+    return con.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,)).fetchone() is not None
+
+def ensure_schema(con: sqlite3.Connection) -> None:
+    """Crea tablas, índices, el índice full-text y los rollups que falten (idempotente)"""
+    with con:
+        for ddl in SCHEMA:
+            con.execute(ddl)
+        new_fts = not _exists(con, "items_fts")
+        for ddl in FTS_SCHEMA:
+            con.execute(ddl)
+        if new_fts:
+            # primera vez: indexar las filas que ya existían ('rebuild' no acepta una vista como content)
+            con.execute("INSERT INTO items_fts(rowid, title, meta, prompt) "
+                        "SELECT id, title, meta, prompt FROM items_search")
+        new_rollup = not _exists(con, "daily_rollup")
+        for ddl in ROLLUP_SCHEMA:
+            con.execute(ddl)
+        if new_rollup:
+            # primera vez: rollups y counters se reconstruyen desde items, desde acá los mantienen los triggers
+            for sql in _ROLLUP_REBUILD:
+                con.execute(sql)
+
+def get_state(con: sqlite3.Connection, key: str, default: str | None = None) -> str | None:
+    row = con.execute("SELECT value FROM ingest_state WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else default
+
+def set_state(con: sqlite3.Connection, key: str, value) -> None:
+    con.execute("INSERT INTO ingest_state(key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, str(value)))
+
+class BatchWriter:
+    """
+    Acumula items y los inserta con executemany en una única transacción
+    por flush(). Usado como context manager, hace flush al salir.
+    """
+
+    def __init__(self, con: sqlite3.Connection):
+        self.con = con
+        self.pending: list[tuple] = []
+
+    def add(self, kind: str, title: str, path: str, ts: str | None = None,
+            cost: float = 0.0, meta: dict | None = None) -> None:
+        ts = ts or dt.datetime.now().isoformat()
+        self.pending.append((ts, kind, title, path, cost,
+                             json.dumps(meta, ensure_ascii=False) if meta is not None else None))
+
+    def flush(self, state: dict | None = None) -> int:
+        """Escribe lo pendiente (y opcionalmente claves de ingest_state) en una transacción"""
+        rows, self.pending = self.pending, []
+        if not rows and not state:
+            return 0
+        with self.con:
+            self.con.executemany(
+                "INSERT INTO items(ts, kind, title, path, cost, meta) VALUES (?, ?, ?, ?, ?, ?)", rows)
+            for k, v in (state or {}).items():
+                set_state(self.con, k, v)
+        return len(rows)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+        else:
+            self.pending.clear()